@@ -1,13 +1,9 @@
 import streamlit as st
-from utils.api import (
-    get_user_id,
-    get_user_leagues,
-    get_league_data,
-    get_users,
-    get_rosters,
-)
+from utils.metrics import serve_metrics_from_env
+from utils.warmup import warm_imports
 
 st.set_page_config(layout="wide", page_title="Fantasy Football Dashboard")
+serve_metrics_from_env()
 st.title("Sleeper Fantasy Football Dashboard")
 st.page_link("pages/historic_performance.py", label="View historic performance", icon="🏆")
 
@@ -48,3 +44,6 @@ All data is pulled directly from the Sleeper API and updates automatically throu
 ---
 *Note: This tool only tracks leagues on the Sleeper platform and requires your leagues to be public.*
 """)
+
+# Load the data pages' dependencies while the landing page is read
+warm_imports()
@@ -0,0 +1,133 @@
+# benchmarks/cold_start.py
+"""
+Cold-start budget for the landing page and the first render of each page.
+
+    python -m benchmarks.cold_start               # check every target against its budget
+    python -m benchmarks.cold_start --repeat 5 --json cold_start.json
+
+Every sample runs in a fresh interpreter with an empty working directory,
+like a container scaled up from zero: nothing imported, nothing on disk.
+Streamlit itself is imported before timing starts, since the server has
+loaded it before any script runs. The rendered-with-data target replays
+the small benchmark fixture so no network is involved. Exits non-zero when
+a target's median time goes over its budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, NamedTuple, Optional
+
+from benchmarks.fixtures import BENCH_USERNAME, build_fixture, save_fixture
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Target(NamedTuple):
+    script: str
+    username: Optional[str]  # Entered on a second run when set
+    budget_ms: float
+
+
+TARGETS = {
+    'landing': Target('app.py', None, 450),
+    'historic_performance': Target('pages/historic_performance.py', None, 400),
+    'season_explorer': Target('pages/season_explorer.py', None, 400),
+    'historic_performance (data)': Target('pages/historic_performance.py', BENCH_USERNAME, 3500),
+}
+
+
+def _child(name: str) -> dict:
+    """Render one target in this (fresh) process and report what it cost"""
+    started = time.perf_counter()
+    import streamlit  # noqa: F401  Loaded by the server before any script runs
+    from streamlit.testing.v1 import AppTest
+    baseline_ms = (time.perf_counter() - started) * 1000
+    from utils.headless import quiet_streamlit_logger
+    quiet_streamlit_logger()
+
+    target = TARGETS[name]
+    app = AppTest.from_file(os.path.join(ROOT, target.script), default_timeout=120)
+    started = time.perf_counter()
+    app.run()
+    first_render_ms = (time.perf_counter() - started) * 1000
+    result = {'first_render_ms': first_render_ms}
+    if target.username:
+        started = time.perf_counter()
+        app.text_input[0].input(target.username).run()
+        result['data_render_ms'] = (time.perf_counter() - started) * 1000
+    if app.exception:
+        raise RuntimeError(f"{name} raised: {app.exception[0].message}")
+
+    result.update(baseline_ms=baseline_ms, render_ms=first_render_ms + result.get('data_render_ms', 0))
+    return result
+
+
+def _sample(name: str, fixture_path: str) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        os.makedirs(os.path.join(workdir, 'utils'))  # Home of the response store, empty
+        env = {
+            **os.environ,
+            'PYTHONPATH': os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])),
+            'SLEEPER_TRANSPORT': 'replay',
+            'SLEEPER_FIXTURE': fixture_path,
+        }
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.cold_start', '--child', name],
+            cwd=workdir, env=env, capture_output=True, text=True, check=True
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(names, repeat: int) -> Dict[str, dict]:
+    results = {}
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        fixture_path = os.path.join(fixture_dir, 'small.json')
+        save_fixture(build_fixture('small'), fixture_path)
+        for name in names:
+            samples = [_sample(name, fixture_path) for _ in range(repeat)]
+            results[name] = {
+                'render_ms': round(statistics.median(s['render_ms'] for s in samples), 1),
+                'first_render_ms': round(statistics.median(s['first_render_ms'] for s in samples), 1),
+                'baseline_ms': round(statistics.median(s['baseline_ms'] for s in samples), 1),
+                'budget_ms': TARGETS[name].budget_ms
+            }
+    return results
+
+
+def print_results(results: Dict[str, dict]):
+    print(f"{'target':<30}{'first':>10}{'total':>10}{'budget':>10}")
+    for name, result in results.items():
+        flag = '' if result['render_ms'] <= result['budget_ms'] else '  OVER BUDGET'
+        print(f"{name:<30}{result['first_render_ms']:>8.0f}ms{result['render_ms']:>8.0f}ms"
+              f"{result['budget_ms']:>8.0f}ms{flag}")
+    baseline = statistics.median(result['baseline_ms'] for result in results.values())
+    print(f"(streamlit import, not counted: {baseline:.0f}ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--targets', nargs='+', choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument('--repeat', type=int, default=3, help="fresh processes per target; the median counts")
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(args.child)))
+        return 0
+
+    results = run(args.targets, args.repeat)
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 1 if any(result['render_ms'] > result['budget_ms'] for result in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
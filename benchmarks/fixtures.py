@@ -0,0 +1,174 @@
+# benchmarks/fixtures.py
+import json
+import random
+from typing import Dict, NamedTuple
+
+BENCH_USERNAME = "bench_user"
+BENCH_USER_ID = "100000"
+LAST_SEASON = 2024
+PLAYOFF_WEEK_START = 15
+ROSTER_SIZE = 15
+
+
+class FixtureSize(NamedTuple):
+    lineages: int  # Leagues the user plays in every season
+    seasons: int
+    teams: int
+
+
+SIZES = {
+    'small': FixtureSize(lineages=1, seasons=3, teams=10),
+    'medium': FixtureSize(lineages=3, seasons=6, teams=12),
+    'large': FixtureSize(lineages=8, seasons=10, teams=12),
+}
+
+
+def _schedule(teams: int, week: int):
+    """Round-robin pairs of roster_ids for a regular season week (circle method)"""
+    ids = list(range(1, teams + 1))
+    rotation = (week - 1) % (teams - 1)
+    ids = [ids[0]] + ids[1:][-rotation:] + ids[1:][:-rotation] if rotation else ids
+    return [(ids[i], ids[-1 - i]) for i in range(teams // 2)]
+
+
+def _league(rng: random.Random, responses: dict, league_id: str, previous_id, name: str,
+            season: int, members: list, players: list):
+    teams = len(members)
+    roster_players = {
+        roster_id: rng.sample(players, ROSTER_SIZE) for roster_id in range(1, teams + 1)
+    }
+    record = {roster_id: {'wins': 0, 'losses': 0, 'ties': 0, 'fpts': 0.0} for roster_id in roster_players}
+
+    def play(week, pairs):
+        matchups = []
+        scores = {}
+        for matchup_id, pair in enumerate(pairs, start=1):
+            for roster_id in pair:
+                players_points = {
+                    player_id: round(rng.uniform(0, 25), 2) for player_id in roster_players[roster_id]
+                }
+                scores[roster_id] = round(sum(sorted(players_points.values())[-9:]), 2)
+                matchups.append({
+                    'roster_id': roster_id,
+                    'matchup_id': matchup_id,
+                    'points': scores[roster_id],
+                    'players': roster_players[roster_id],
+                    'players_points': players_points
+                })
+        playing = {roster_id for pair in pairs for roster_id in pair}
+        matchups += [
+            {'roster_id': roster_id, 'matchup_id': None, 'points': 0, 'players': roster_players[roster_id],
+             'players_points': {}}
+            for roster_id in roster_players if roster_id not in playing
+        ]
+        responses[f"league/{league_id}/matchups/{week}"] = matchups
+        return scores
+
+    for week in range(1, PLAYOFF_WEEK_START):
+        scores = play(week, _schedule(teams, week))
+        for a, b in _schedule(teams, week):
+            record[a]['fpts'] += scores[a]
+            record[b]['fpts'] += scores[b]
+            winner, loser = (a, b) if scores[a] >= scores[b] else (b, a)
+            record[winner]['wins'] += 1
+            record[loser]['losses'] += 1
+
+    # Six-team bracket seeded by record: byes for the top two seeds
+    seeds = sorted(record, key=lambda roster_id: (-record[roster_id]['wins'], -record[roster_id]['fpts']))
+    bracket = []
+
+    def round_of(r, pairs, first_match):
+        scores = play(PLAYOFF_WEEK_START + r - 1, pairs)
+        winners = []
+        for m, (t1, t2) in enumerate(pairs, start=first_match):
+            w, l = (t1, t2) if scores[t1] >= scores[t2] else (t2, t1)
+            bracket.append({'r': r, 'm': m, 't1': t1, 't2': t2, 'w': w, 'l': l})
+            winners.append(w)
+        return winners
+
+    quarter = round_of(1, [(seeds[2], seeds[5]), (seeds[3], seeds[4])], 1)
+    semi = round_of(2, [(seeds[0], quarter[1]), (seeds[1], quarter[0])], 3)
+    champion = round_of(3, [tuple(semi)], 5)[0]
+
+    responses[f"league/{league_id}"] = {
+        'league_id': league_id,
+        'previous_league_id': previous_id,
+        'name': name,
+        'season': str(season),
+        'status': 'complete',
+        'total_rosters': teams,
+        'settings': {'playoff_week_start': PLAYOFF_WEEK_START, 'leg': 18},
+        'metadata': {'latest_league_winner_roster_id': str(champion)}
+    }
+    responses[f"league/{league_id}/users"] = [
+        {'user_id': user_id, 'display_name': f"manager_{user_id}", 'metadata': {'team_name': f"Team {user_id}"}}
+        for user_id in members
+    ]
+    responses[f"league/{league_id}/rosters"] = [
+        {
+            'roster_id': roster_id,
+            'owner_id': members[roster_id - 1],
+            'players': roster_players[roster_id],
+            'settings': {
+                'wins': stats['wins'], 'losses': stats['losses'], 'ties': 0,
+                'fpts': int(stats['fpts']), 'fpts_decimal': int(round(stats['fpts'] % 1 * 100))
+            }
+        }
+        for roster_id, stats in record.items()
+    ]
+    responses[f"league/{league_id}/winners_bracket"] = bracket
+    return responses[f"league/{league_id}"]
+
+
+def build_fixture(size: str, seed: int = 0) -> Dict[str, object]:
+    """
+    A synthetic but complete Sleeper history for BENCH_USERNAME, as
+    {API path: decoded JSON body}. The same size and seed always produce
+    the same fixture, so timings and call counts are comparable across runs.
+    """
+    spec = SIZES[size]
+    rng = random.Random(f"{size}:{seed}")
+    first_season = LAST_SEASON - spec.seasons + 1
+    players = [str(1000 + i) for i in range(spec.teams * ROSTER_SIZE * 2)]
+    managers = [str(200000 + i) for i in range(spec.lineages * spec.teams * 2)]
+
+    responses = {
+        f"user/{BENCH_USERNAME}": {'user_id': BENCH_USER_ID, 'username': BENCH_USERNAME},
+        'state/nfl': {'season': str(LAST_SEASON), 'league_season': str(LAST_SEASON),
+                      'season_type': 'off', 'week': 18}
+    }
+    season_leagues = {season: [] for season in range(first_season, LAST_SEASON + 1)}
+    for lineage in range(spec.lineages):
+        # A core group stays together; a couple of seats turn over each season
+        pool = managers[lineage * spec.teams * 2:(lineage + 1) * spec.teams * 2]
+        members = [BENCH_USER_ID] + pool[:spec.teams - 1]
+        previous_id = None
+        for season in range(first_season, LAST_SEASON + 1):
+            league_id = str(10 ** 9 + lineage * 100 + season - 2000)
+            rng.shuffle(members)
+            league = _league(rng, responses, league_id, previous_id, f"Bench League {lineage + 1}",
+                             season, members, players)
+            season_leagues[season].append(league)
+            previous_id = league_id
+            bench_seat = members.index(BENCH_USER_ID)
+            leaving = rng.choice([i for i in range(len(members)) if i != bench_seat])
+            members[leaving] = rng.choice([m for m in pool if m not in members])
+
+    for season, leagues in season_leagues.items():
+        responses[f"user/{BENCH_USER_ID}/leagues/nfl/{season}"] = leagues
+    responses['players/nfl'] = {
+        player_id: {'player_id': player_id, 'first_name': 'Player', 'last_name': player_id,
+                    'position': rng.choice(['QB', 'RB', 'WR', 'TE', 'K', 'DEF']), 'team': 'FA'}
+        for player_id in players
+    }
+    return responses
+
+
+def load_fixture(path: str) -> Dict[str, object]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_fixture(responses: Dict[str, object], path: str):
+    with open(path, 'w') as f:
+        json.dump(responses, f, separators=(',', ':'))
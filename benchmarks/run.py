@@ -0,0 +1,226 @@
+# benchmarks/run.py
+"""
+End-to-end benchmarks for the data layer and chart builders, run offline
+against deterministic Sleeper fixtures of several sizes.
+
+    python -m benchmarks.run                      # every size
+    python -m benchmarks.run --sizes small medium --latency 20
+    python -m benchmarks.run --json results.json  # save for later comparison
+    python -m benchmarks.run --compare results.json
+
+Each stage is timed cold (empty response store and caches) and warm
+(everything cached), then run again under tracemalloc for its peak memory.
+--compare exits non-zero when a stage got more than --threshold slower or
+made more API calls than the baseline.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import streamlit as st
+
+from utils.headless import quiet_streamlit_logger
+
+quiet_streamlit_logger()
+
+from benchmarks.fixtures import BENCH_USERNAME, SIZES, build_fixture, load_fixture
+from components.performance_chart import build_comparison_figure, build_performance_figure
+from utils.api import configure_client
+from utils.data_cache import (
+    analyze_head_to_head_optimized,
+    get_cached_league_info,
+    get_cached_league_matchups,
+    get_user_performance_optimized
+)
+from utils.data_processing import create_player_points_df, create_roster_df
+from utils.identity import identity_index
+from utils.players import PlayerCache
+from utils.metrics import diff_snapshots, metrics
+from utils.nfl_calendar import nfl_calendar
+from utils.rate_limit import rate_limiter
+from utils.response_store import response_store
+from utils.transport import REPLAY, ReplayAdapter
+
+REGRESSION_THRESHOLD = 0.2  # Fractional slowdown --compare tolerates
+
+
+def _reset_stores(directory: str):
+    """Point the persistent stores at a fresh file and drop every in-memory cache"""
+    fd, path = tempfile.mkstemp(suffix='.sqlite3', dir=directory)
+    os.close(fd)  # SQLite takes an empty file as a new database
+    response_store.reopen(path)
+    identity_index.reopen(path)
+    st.cache_data.clear()
+
+
+def _stages(fixture: dict, username: str, directory: str) -> List[tuple]:
+    """(name, callable) pairs run in order; later stages reuse earlier results"""
+    state = {}
+    # A store of its own, so the cold pass streams players/nfl into SQLite and the warm pass reads it
+    player_cache = PlayerCache(os.path.join(tempfile.mkdtemp(dir=directory), 'players.sqlite3'))
+
+    def performance():
+        state['performance'] = get_user_performance_optimized(username)
+
+    def head_to_head():
+        performance = state['performance']
+        league_ids = performance['league_id'].unique()
+        user_id = fixture[f"user/{username}"]['user_id']
+        league_info = get_cached_league_info(league_ids[-1])
+        opponent_id = next(
+            roster['owner_id'] for roster in league_info['rosters'] if roster['owner_id'] != user_id
+        )
+        state['h2h'] = analyze_head_to_head_optimized(league_ids, user_id, opponent_id)
+
+    def roster():
+        league_id = state['performance']['league_id'].iloc[-1]
+        league_info = get_cached_league_info(league_id)
+        matchups = get_cached_league_matchups(league_id)
+        weekly = {
+            week: fixture.get(f"league/{league_id}/matchups/{week}")
+            for week in sorted(matchups['week'].unique())
+        }
+        points = create_player_points_df(weekly)
+        players = player_cache.get_players()
+        for roster_data in league_info['rosters']:
+            create_roster_df(roster_data, players, points)
+
+    def charts():
+        performance = state['performance']
+        build_performance_figure(performance, username)
+        build_comparison_figure(performance, performance.assign(**{'Games Above 500': 0}),
+                                username, 'opponent')
+
+    return [
+        ('user_performance', performance),
+        ('head_to_head', head_to_head),
+        ('roster_df', roster),
+        ('charts', charts)
+    ]
+
+
+def _measure(stage: Callable, adapter: ReplayAdapter, memory: bool = False) -> dict:
+    calls, before = adapter.calls, metrics.snapshot()
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    stage()
+    elapsed = time.perf_counter() - start
+    result = {}
+    if memory:
+        result['peak_kib'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+    store = [
+        counts for cache, counts in diff_snapshots(before, metrics.snapshot())['caches'].items()
+        if cache.startswith('store/')
+    ]
+    hits = sum(counts['hits'] for counts in store)
+    lookups = hits + sum(counts['misses'] for counts in store)
+    result.update({
+        'seconds': round(elapsed, 4),
+        'api_calls': adapter.calls - calls,
+        'store_hit_rate': round(hits / lookups, 3) if lookups else None
+    })
+    return result
+
+
+def run_benchmark(fixture: dict, username: str, latency: float, directory: str) -> Dict[str, dict]:
+    """Cold, warm and memory passes over every stage for one fixture"""
+    adapter = configure_client(transport=REPLAY, fixture=fixture, replay_latency=latency).transport
+
+    results = {}
+    _reset_stores(directory)
+    # Pin the season to the fixture's NFL state now, rather than racing a background refresh
+    nfl_calendar.refresh()
+    stages = _stages(fixture, username, directory)
+    for name, stage in stages:
+        results[name] = {'cold': _measure(stage, adapter)}
+    for name, stage in stages:
+        results[name]['warm'] = _measure(stage, adapter)
+
+    # Separate pass so tracemalloc overhead stays out of the timings
+    _reset_stores(directory)
+    for name, stage in _stages(fixture, username, directory):
+        results[name]['cold']['peak_kib'] = _measure(stage, adapter, memory=True)['peak_kib']
+    return results
+
+
+def _print_results(results: Dict[str, Dict[str, dict]]):
+    print(f"{'fixture':<14}{'stage':<18}{'pass':<6}{'seconds':>10}{'api calls':>11}"
+          f"{'store hits':>12}{'peak KiB':>11}")
+    for fixture_name, stages in results.items():
+        for stage, passes in stages.items():
+            for pass_name, result in passes.items():
+                hit_rate = result['store_hit_rate']
+                print(f"{fixture_name:<14}{stage:<18}{pass_name:<6}{result['seconds']:>10.4f}"
+                      f"{result['api_calls']:>11}{'-' if hit_rate is None else f'{hit_rate:.0%}':>12}"
+                      f"{result.get('peak_kib', ''):>11}")
+
+
+def _compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Stages that got slower than the threshold allows, or made more API calls"""
+    regressions = []
+    for fixture_name, stages in results.items():
+        for stage, passes in stages.items():
+            for pass_name, result in passes.items():
+                before = baseline.get(fixture_name, {}).get(stage, {}).get(pass_name)
+                if not before:
+                    continue
+                label = f"{fixture_name}/{stage}/{pass_name}"
+                if result['seconds'] > before['seconds'] * (1 + threshold):
+                    regressions.append(f"{label}: {before['seconds']:.4f}s -> {result['seconds']:.4f}s")
+                if result['api_calls'] > before['api_calls']:
+                    regressions.append(f"{label}: {before['api_calls']} -> {result['api_calls']} API calls")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', choices=sorted(SIZES), default=list(SIZES))
+    parser.add_argument('--fixture', action='append', default=[],
+                        help="Recorded fixture JSON ({path: body}) to run in addition to the sizes")
+    parser.add_argument('--username', default=BENCH_USERNAME, help="User whose history a recorded fixture holds")
+    parser.add_argument('--latency', type=float, default=0.0, help="Simulated milliseconds per API call")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="Write results to this file")
+    parser.add_argument('--compare', help="Baseline results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    # The fixture is local, so the shared limiter would only measure itself
+    rate_limiter.configure(requests_per_minute=10 ** 9, burst=10 ** 9)
+
+    fixtures = {
+        size: (BENCH_USERNAME, lambda size=size: build_fixture(size, args.seed))
+        for size in args.sizes
+    }
+    fixtures.update({
+        os.path.splitext(os.path.basename(path))[0]: (args.username, lambda path=path: load_fixture(path))
+        for path in args.fixture
+    })
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (username, load) in fixtures.items():
+            results[name] = run_benchmark(load(), username, args.latency / 1000, directory)
+    _print_results(results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = _compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import streamlit as st
+import pandas as pd
+from utils.metrics import metrics
+
+def _endpoint_table(endpoints):
+    table = pd.DataFrame.from_dict(endpoints, orient='index')
+    table['avg_ms'] = (table['total_ms'] / table['calls']).round(1)
+    table['KiB'] = (table['bytes'] / 1024).round(1)
+    columns = [col for col in ['calls', 'errors', 'not_modified', 'avg_ms', 'p50_ms', 'p95_ms', 'KiB']
+               if col in table.columns]
+    return table[columns].rename_axis('Endpoint').sort_values('calls', ascending=False)
+
+def _cache_table(caches):
+    table = pd.DataFrame.from_dict(caches, orient='index')
+    lookups = table['hits'] + table['misses']
+    table['hit_rate'] = (table['hits'] / lookups.where(lookups > 0)).round(3)
+    return table.rename_axis('Cache').sort_index()
+
+def display_debug_panel(run_metrics=None):
+    """
+    Show Sleeper API and cache instrumentation: what this render did (when
+    given the RunMetrics from metrics.begin_run) and process totals.
+    """
+    snapshot = metrics.snapshot()
+
+    if run_metrics is not None:
+        render = run_metrics.snapshot()
+        st.markdown("#### This render")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("API calls", int(sum(s['calls'] for s in render['endpoints'].values())))
+        with col2:
+            st.metric("API time (ms)", round(sum(s['total_ms'] for s in render['endpoints'].values())))
+        with col3:
+            hits = sum(c['hits'] for c in render['caches'].values())
+            lookups = hits + sum(c['misses'] for c in render['caches'].values())
+            st.metric("Cache hit rate", f"{hits / lookups:.0%}" if lookups else "–")
+        if render['endpoints']:
+            st.dataframe(pd.DataFrame.from_dict(render['endpoints'], orient='index').rename_axis('Endpoint'),
+                         use_container_width=True)
+
+    st.markdown("#### Since start (all sessions and background work)")
+    if snapshot['endpoints']:
+        st.dataframe(_endpoint_table(snapshot['endpoints']), use_container_width=True)
+    else:
+        st.caption("No Sleeper API calls yet")
+    if snapshot['caches']:
+        st.dataframe(_cache_table(snapshot['caches']), use_container_width=True)
+
+    limiter = snapshot['rate_limiter']
+    st.caption(
+        f"Rate limiter: {limiter['tokens']} tokens, {limiter['queued']} queued, "
+        f"{limiter['throttled']} throttled by the server"
+    )
+    st.dataframe(pd.DataFrame.from_dict(limiter['priorities'], orient='index').rename_axis('Priority'),
+                 use_container_width=True)
@@ -1,5 +1,9 @@
+import numpy as np
 import streamlit as st
 import pandas as pd
+from components.pagination import paginate
+from utils.head_to_head import compute_head_to_head_stats
+from utils.tracing import span
 
 def display_head_to_head_summary(username, selected_manager_name, matchup_df):
     """Display head-to-head matchup summary"""
@@ -9,20 +13,10 @@ def display_head_to_head_summary(username, selected_manager_name, matchup_df):
         st.write("No head-to-head matchups found")
         return
 
-    # Filter out incomplete matchups
-    complete_matchups = matchup_df[
-        ~((matchup_df['User Score'] == 0) | (matchup_df['Opponent Score'] == 0))
-    ]
-    
-    if complete_matchups.empty:
-        st.write("No completed matchups found")
-        return
-
-    # Calculate stats
-    total_matchups = len(complete_matchups)
-    wins = len(complete_matchups[complete_matchups['Result'] == 'Win'])
-    losses = len(complete_matchups[complete_matchups['Result'] == 'Loss'])
-    ties = len(complete_matchups[complete_matchups['Result'] == 'Tie'])
+    # Every figure below comes from one pass of the stats engine; the history holds completed games only
+    with span('compute_head_to_head_stats', games=len(matchup_df)):
+        stats = compute_head_to_head_stats(matchup_df)
+    total_matchups, wins, losses, ties = stats.meetings, stats.wins, stats.losses, stats.ties
     
     # Calculate series text
     if wins > losses:
@@ -47,48 +41,66 @@ def display_head_to_head_summary(username, selected_manager_name, matchup_df):
         st.subheader(series_text)
         st.text(record)
     
-    # Calculate playoff record if Type column exists
-    if 'Type' in complete_matchups.columns:
-        playoff_df = complete_matchups[complete_matchups['Type'].str.contains('Playoffs', na=False)]
-        if not playoff_df.empty:
-            playoff_wins = len(playoff_df[playoff_df['Result'] == 'Win'])
-            playoff_losses = len(playoff_df[playoff_df['Result'] == 'Loss'])
-            with col3:
-                st.caption("Playoff record 🏆")
-                st.subheader(f"{playoff_wins}–{playoff_losses}")
+    playoffs = stats.splits[stats.splits['Type'] == 'Playoffs']
+    if not playoffs.empty:
+        with col3:
+            st.caption("Playoff record 🏆")
+            st.subheader(f"{playoffs['Wins'].iloc[0]}–{playoffs['Losses'].iloc[0]}")
+    
+    # Streaks and scoring
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.caption("Current streak")
+        st.subheader(stats.current_streak)
+        st.text(f"Longest: W{stats.longest_win_streak} / L{stats.longest_loss_streak}")
+    
+    with col2:
+        st.caption("Average score")
+        st.subheader(f"{stats.avg_points_for:.1f} – {stats.avg_points_against:.1f}")
+        st.text(f"Average margin: {stats.avg_margin:+.1f}")
+    
+    with col3:
+        st.caption("Largest margins")
+        st.subheader(f"+{stats.largest_win:.1f} / -{stats.largest_loss:.1f}")
+    
+    with st.expander("Season by season"):
+        st.dataframe(stats.seasons.astype({'Season': str}), use_container_width=True, hide_index=True)
+    
+    with st.expander("Regular season vs playoffs"):
+        st.dataframe(stats.splits, use_container_width=True, hide_index=True)
+        st.caption("Margin of victory or defeat")
+        st.dataframe(stats.margins, use_container_width=True, hide_index=True)
     
     st.write("")
     st.write("Matchup History")
     
-    # Create a display DataFrame
-    display_df = complete_matchups.copy()
-    display_df['Score'] = display_df.apply(
-        lambda x: f"{x['User Score']:.1f} - {x['Opponent Score']:.1f}", 
-        axis=1
+    # Create a display DataFrame with column-wise operations
+    display_df = matchup_df.copy()
+    display_df['Score'] = (
+        display_df['User Score'].map('{:.1f}'.format) + ' - ' +
+        display_df['Opponent Score'].map('{:.1f}'.format)
     )
     display_df['Diff'] = (display_df['User Score'] - display_df['Opponent Score']).abs().round(1)
-    display_df['Winner'] = display_df.apply(
-        lambda x: username if x['Result'] == 'Win' else selected_manager_name,
-        axis=1
-    )
+    display_df['Winner'] = np.where(display_df['Result'] == 'Win', username, selected_manager_name)
     
     # Add playoff indicator to league name if it's a playoff game
     if 'Type' in display_df.columns:
-        display_df['League'] = display_df.apply(
-            lambda x: f"{x['League']} 🏆" if 'Playoffs' in str(x.get('Type', '')) else x['League'],
-            axis=1
-        )
-    
-    # Convert Season to string to prevent comma formatting
-    display_df['Season'] = display_df['Season'].astype(str)
+        is_playoff = display_df['Type'].astype(str).str.contains('Playoffs')
+        display_df['League'] = display_df['League'].where(~is_playoff, display_df['League'] + ' 🏆')
     
     # Prepare display columns and sort
     display_columns = ['Season', 'Week', 'League', 'Score', 'Winner', 'Diff']
-    display_df = display_df.sort_values(['Season', 'Week'], ascending=[False, True])
+    sort_week = 'week' if 'week' in display_df.columns else 'Week'
+    display_df = display_df.sort_values(['Season', sort_week], ascending=[False, True])
+    
+    # Convert Season and Week to strings to prevent comma formatting and mixed types
+    display_df['Season'] = display_df['Season'].astype(str)
+    display_df['Week'] = display_df['Week'].astype(str)
     
-    # Display the table
+    # Display one page of the table
     st.dataframe(
-        display_df[display_columns],
+        paginate(display_df[display_columns], key=f"h2h_history_page_{selected_manager_name}"),
         use_container_width=True,
         hide_index=True
-    )
\ No newline at end of file
+    )
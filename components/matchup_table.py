@@ -1,5 +1,7 @@
+import numpy as np
 import streamlit as st
 import pandas as pd
+from components.pagination import paginate
 
 def display_matchup_table(matchup_df, username, selected_manager_name):
     """Display the game results table with improved formatting."""
@@ -42,35 +44,37 @@ def display_matchup_table(matchup_df, username, selected_manager_name):
         </style>
     """, unsafe_allow_html=True)
 
-    # Create the table rows dynamically
-    rows = []
-    for idx, row in matchup_df.iterrows():
-        diff = row['User Score'] - row['Opponent Score']
-        is_user_win = diff > 0
-        
-        if is_user_win:
-            winner = username
-            winner_score = row['User Score']
-            loser_score = row['Opponent Score']
-            row_class = 'win-row'
-        else:
-            winner = selected_manager_name
-            winner_score = row['Opponent Score']
-            loser_score = row['User Score']
-            row_class = 'loss-row'
-        
-        # Prepare each row
-        rows.append(f"""
-            <tr class="{row_class}">
-                <td>{idx + 1}</td>
-                <td>{row['Season']}</td>
-                <td>{row['Week']}</td>
-                <td>{row['League']}</td>
-                <td>{'**' if is_user_win else ''}{winner_score:.1f}{'**' if is_user_win else ''} - {'**' if not is_user_win else ''}{loser_score:.1f}{'**' if not is_user_win else ''}</td>
-                <td class="winner">**{winner}**</td>
-                <td>{abs(diff):.1f}</td>
-            </tr>
-        """)
+    # Number every game, then build only the page being shown
+    page = paginate(
+        matchup_df.assign(No=np.arange(1, len(matchup_df) + 1)),
+        key=f"matchup_table_page_{selected_manager_name}"
+    )
+    
+    user_score = page['User Score']
+    opp_score = page['Opponent Score']
+    is_user_win = (user_score - opp_score > 0).to_numpy()
+    winner_score = np.where(is_user_win, user_score, opp_score)
+    loser_score = np.where(is_user_win, opp_score, user_score)
+    
+    def bold(scores, condition):
+        formatted = pd.Series(scores, index=page.index).map('{:.1f}'.format)
+        return formatted.where(~condition, '<b>' + formatted + '</b>')
+    
+    winner = pd.Series(np.where(is_user_win, username, selected_manager_name), index=page.index)
+    row_class = pd.Series(np.where(is_user_win, 'win-row', 'loss-row'), index=page.index)
+    
+    # Prepare every row with column-wise string operations
+    rows = (
+        '<tr class="' + row_class + '">'
+        + '<td>' + page['No'].astype(str) + '</td>'
+        + '<td>' + page['Season'].astype(str) + '</td>'
+        + '<td>' + page['Week'].astype(str) + '</td>'
+        + '<td>' + page['League'].astype(str) + '</td>'
+        + '<td>' + bold(winner_score, is_user_win) + ' - ' + bold(loser_score, ~is_user_win) + '</td>'
+        + '<td class="winner"><b>' + winner + '</b></td>'
+        + '<td>' + (user_score - opp_score).abs().map('{:.1f}'.format) + '</td>'
+        + '</tr>'
+    )
 
     # Render the table
     st.markdown(f"""
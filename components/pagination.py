@@ -0,0 +1,22 @@
+import streamlit as st
+
+PAGE_SIZE = 25  # Rows sent to the browser per page of a long table
+
+def paginate(df, key, page_size=PAGE_SIZE):
+    """Slice out the page the user picked so only that page is rendered"""
+    total = len(df)
+    pages = max(1, -(-total // page_size))  # Ceiling division
+    if pages == 1:
+        return df
+    
+    page = st.number_input(
+        f"Page (of {pages})",
+        min_value=1,
+        max_value=pages,
+        value=1,
+        step=1,
+        key=key
+    )
+    start = (page - 1) * page_size
+    st.caption(f"Showing {start + 1}–{min(start + page_size, total)} of {total}")
+    return df.iloc[start:start + page_size]
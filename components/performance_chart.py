@@ -1,60 +1,74 @@
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 import pandas as pd
+from utils.tracing import span
 
-def display_performance_chart(filtered_df, username):
-    """Display single user performance chart"""
+LARGE_HISTORY = 200  # Rows beyond which charts switch to WebGL rendering
+MAX_LABELS = 120  # Standing labels drawn at most; larger histories label every nth point
+
+def _standing_labels(fig, df, webgl):
+    """Add every standing label as a single text trace instead of one annotation per row"""
+    if df.empty:
+        return
+    step = -(-len(df) // MAX_LABELS)  # Ceiling division
+    labels = df.iloc[::step]
+    scatter = go.Scattergl if webgl else go.Scatter
+    fig.add_trace(scatter(
+        x=labels['Season'],
+        y=labels['Games Above 500'],
+        text='#' + labels['Standing'].astype(str) + '/' + labels['Total Teams'].astype(str),
+        mode='text',
+        textposition='top center',
+        hoverinfo='skip',
+        showlegend=False
+    ))
+
+@st.cache_data(max_entries=64)
+def build_performance_figure(filtered_df, username):
+    """Single user performance figure, cached by the content of its inputs"""
+    webgl = len(filtered_df) > LARGE_HISTORY
     fig = px.line(
-        filtered_df, 
+        filtered_df,
         x='Season',
         y='Games Above 500',
         title=f"Performance Over Time - {username}",
-        markers=True
+        markers=True,
+        render_mode='webgl' if webgl else 'svg'
     )
-    
-    # Add standings annotations
-    for _, row in filtered_df.iterrows():
-        fig.add_annotation(
-            x=row['Season'],
-            y=row['Games Above 500'],
-            text=f"#{row['Standing']}/{row['Total Teams']}",
-            showarrow=False,
-            yshift=20
-        )
-        
-    return st.plotly_chart(fig, use_container_width=True)
+    _standing_labels(fig, filtered_df, webgl)
+    return fig
 
-def display_comparison_chart(filtered_df, compare_filtered, username, selected_manager_name):
-    """Display comparison chart between two users"""
-    compare_fig = px.line(
-        pd.concat([
-            filtered_df.assign(Manager=username),
-            compare_filtered.assign(Manager=selected_manager_name)
-        ]),
+@st.cache_data(max_entries=64)
+def build_comparison_figure(filtered_df, compare_filtered, username, selected_manager_name):
+    """Two user comparison figure, cached by the content of its inputs"""
+    combined = pd.concat([
+        filtered_df.assign(Manager=username),
+        compare_filtered.assign(Manager=selected_manager_name)
+    ])
+    webgl = len(combined) > LARGE_HISTORY
+    fig = px.line(
+        combined,
         x='Season',
         y='Games Above 500',
         color='Manager',
         title="Performance Comparison",
-        markers=True
+        markers=True,
+        render_mode='webgl' if webgl else 'svg'
     )
-    
-    # Add standings annotations for both users
-    for _, row in filtered_df.iterrows():
-        compare_fig.add_annotation(
-            x=row['Season'],
-            y=row['Games Above 500'],
-            text=f"#{row['Standing']}/{row['Total Teams']}",
-            showarrow=False,
-            yshift=20
-        )
-    
-    for _, row in compare_filtered.iterrows():
-        compare_fig.add_annotation(
-            x=row['Season'],
-            y=row['Games Above 500'],
-            text=f"#{row['Standing']}/{row['Total Teams']}",
-            showarrow=False,
-            yshift=20
-        )
-        
-    return st.plotly_chart(compare_fig, use_container_width=True)
\ No newline at end of file
+    _standing_labels(fig, combined, webgl)
+    return fig
+
+def display_performance_chart(filtered_df, username, key=None):
+    """Display single user performance chart"""
+    with span('build_performance_figure', rows=len(filtered_df)):
+        fig = build_performance_figure(filtered_df, username)
+    with span('plotly_chart'):
+        return st.plotly_chart(fig, use_container_width=True, key=key)
+
+def display_comparison_chart(filtered_df, compare_filtered, username, selected_manager_name):
+    """Display comparison chart between two users"""
+    with span('build_comparison_figure', rows=len(filtered_df) + len(compare_filtered)):
+        fig = build_comparison_figure(filtered_df, compare_filtered, username, selected_manager_name)
+    with span('plotly_chart'):
+        return st.plotly_chart(fig, use_container_width=True)
@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from utils.data_processing import create_roster_df
+from utils.data_processing import create_roster_df, create_player_points_df
 
 def display_roster(users_df, rosters, players_data, weekly_stats):
     selected_user = st.selectbox(
@@ -8,6 +8,10 @@ def display_roster(users_df, rosters, players_data, weekly_stats):
         users_df['Display Name'].tolist()
     )
     
+    # Build the league's player-points table once for every roster lookup
+    if not isinstance(weekly_stats, pd.DataFrame):
+        weekly_stats = create_player_points_df(weekly_stats)
+    
     if selected_user:
         user_id = users_df[users_df['Display Name'] == selected_user]['user_id'].iloc[0]
         roster = next((r for r in rosters if r['owner_id'] == user_id), None)
@@ -15,7 +19,7 @@ def display_roster(users_df, rosters, players_data, weekly_stats):
         if roster:
             roster_df = create_roster_df(roster, players_data, weekly_stats)
             if not roster_df.empty:
-                st.dataframe(roster_df)
+                st.dataframe(roster_df.drop(columns=['Weekly Points']))
                 
                 selected_player_name = st.selectbox(
                     "Select Player for Stats",
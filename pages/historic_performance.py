@@ -1,166 +1,138 @@
 #test
+import time
 import streamlit as st
-import pandas as pd
-from utils.api import (
-    get_user_id,
-    get_user_leagues,
-    get_league_data,
-    get_users,
-    get_rosters,
-    get_matchups_for_week
-)
-from components.performance_chart import display_performance_chart, display_comparison_chart
-from components.head_to_head import display_head_to_head_summary
-from components.matchup_table import display_matchup_table
-from components.career_summary import format_stat, display_career_summary
-from utils.data_cache import (
-    get_user_performance_optimized,
-    analyze_head_to_head_optimized
-)
+from utils.metrics import metrics, serve_metrics_from_env
+from utils.tracing import begin_run, span
+from utils.warmup import warm_imports
 
-def get_user_performance(username):
-    """Get performance data for a user"""
-    user_id = get_user_id(username)
-    if not user_id:
-        return None
-    
-    performance_data = []
-    
-    for season in range(2015, 2025):
-        leagues = get_user_leagues(user_id, str(season))
-        if leagues:
-            for league in leagues:
-                try:  # Add try/except block for better error handling
-                    league_id = league['league_id']
-                    rosters = get_rosters(league_id)
-                    users = get_users(league_id)
-                    league_data = get_league_data(league_id)
-                    
-                    # Skip this league if we don't have all required data
-                    if not all([rosters, users, league_data]):
-                        continue
-                    
-                    user_roster = next((r for r in rosters if r['owner_id'] == user_id), None)
-                    if user_roster:
-                        wins = user_roster['settings'].get('wins', 0)
-                        losses = user_roster['settings'].get('losses', 0)
-                        
-                        # Sort rosters by wins to get standing
-                        sorted_rosters = sorted(rosters, 
-                                             key=lambda x: (x['settings'].get('wins', 0), 
-                                                          x['settings'].get('fpts', 0)), 
-                                             reverse=True)
-                        standing = next((i + 1 for i, r in enumerate(sorted_rosters) 
-                                      if r['roster_id'] == user_roster['roster_id']), None)
-                        
-                        # Check if user is champion - only for completed seasons
-                        is_champion = False
-                        # More defensive championship check
-                        try:
-                            if (league_data and 
-                                isinstance(league_data, dict) and 
-                                league_data.get('status') == 'complete' and 
-                                isinstance(league_data.get('metadata'), dict)):
-                                winner_roster_id = league_data.get('metadata', {}).get('latest_league_winner_roster_id')
-                                if winner_roster_id:
-                                    is_champion = str(user_roster['roster_id']) == str(winner_roster_id)
-                        except:
-                            is_champion = False
-                        
-                        # Calculate various achievements
-                        total_teams = len(rosters)
-                        is_regular_season_winner = standing == 1
-                        is_last = standing == total_teams
-                        in_top_6 = standing <= 6 if total_teams >= 8 else standing <= (total_teams * 0.75)
-                        in_bottom_4 = standing > (total_teams - 4) if total_teams >= 8 else standing > (total_teams * 0.5)
-                        
-                        performance_data.append({
-                            'Season': season,
-                            'League': league['name'],
-                            'Games Above 500': wins - losses,
-                            'Standing': standing,
-                            'Total Teams': total_teams,
-                            'Is Regular Season Winner': is_regular_season_winner,
-                            'Is Last': is_last,
-                            'In Top 6': in_top_6,
-                            'In Bottom 4': in_bottom_4,
-                            'Is Champion': is_champion,
-                            'league_id': league_id
-                        })
-                except Exception as e:
-                    st.warning(f"Error processing league for season {season}: {str(e)}")
-                    continue
-    
-    return pd.DataFrame(performance_data)
+# pandas, plotly and the data layer are imported once a username is entered,
+# so the empty page renders without them on a cold start
 
-def display_debug_info(debug_data, username, opponent_name):
-    """Display debug information for playoff detection"""
-    st.markdown("### Debug Information - Playoff Detection")
-    st.markdown(f"Analyzing matchups between **{username}** and **{opponent_name}**")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric("Total Leagues", debug_data['total_leagues_checked'])
-    with col2:
-        st.metric("Leagues with Playoffs", debug_data['leagues_with_playoffs'])
-    with col3:
-        st.metric("Playoff Matchups Found", len(debug_data['playoff_matchups_found']))
-    
-    if debug_data['playoff_matchups_found']:
-        st.markdown("#### Found Playoff Matchups:")
-        for match in debug_data['playoff_matchups_found']:
-            st.markdown(f"""
-            - Season: {match['season']}
-              - League: {match['league']}
-              - Round: {match['round']}
-            """)
+STREAM_REDRAW_INTERVAL = 0.5  # Seconds between progressive redraws while leagues load
+
+def display_debug_info(run_metrics):
+    """Sleeper API timings and cache hit/miss counts, shown when debug mode is on"""
+    if st.sidebar.checkbox("Show debug info", value=st.query_params.get('debug') == '1'):
+        from components.debug_panel import display_debug_panel
+        with st.expander("Debug Information", expanded=True):
+            display_debug_panel(run_metrics)
+
+def display_trace_export(trace):
+    """Offer the finished run's spans as Chrome trace-event JSON"""
+    st.sidebar.download_button(
+        "Download trace",
+        data=trace.to_chrome_json(),
+        file_name="historic_performance_trace.json",
+        mime="application/json",
+        help="Open in chrome://tracing or ui.perfetto.dev"
+    )
+
+def display_prefetch_status(prefetch_job):
+    """Background matchup prefetch status: polled while the job runs, static once it is done"""
+    if prefetch_job.done:
+        st.caption(f"Matchup history loaded for {prefetch_job.completed} leagues")
     else:
-        st.warning("No playoff matchups were found between these users")
+        display_prefetch_progress(prefetch_job)
 
-def analyze_head_to_head(league_ids, user_id, opponent_id, username, opponent_name):
-    """Analyze head-to-head matchups between two users"""
-    matchup_history = []
-    debug_info = {
-        'total_leagues_checked': len(league_ids),
-        'leagues_with_playoffs': 0,
-        'playoff_brackets_found': [],
-        'playoff_matchups_found': []
-    }
-    
-    # Place debug info display before processing matchups
-    st.markdown("---")  # Add separator
-    display_debug_info(debug_info, username, opponent_name)
-    st.markdown("---")  # Add separator
+@st.fragment(run_every=1)
+def display_prefetch_progress(prefetch_job):
+    """Show background matchup prefetch progress without blocking the page"""
+    if prefetch_job.done:
+        # A fragment can't cancel its own timer; one full rerun swaps it for the static caption
+        st.rerun()
+    st.progress(
+        prefetch_job.progress,
+        text=f"Loading matchup history… {prefetch_job.completed}/{prefetch_job.total} leagues"
+    )
 
-def get_manager_mapping(league_ids):
-    """Get mapping of user_ids to their most recent display names"""
-    manager_data = {}
+def stream_user_performance(username):
+    """
+    Render the career summary and performance chart progressively while the
+    user's leagues load, then return the complete performance DataFrame.
+    Redraws are throttled to STREAM_REDRAW_INTERVAL seconds.
+    """
+    summary_placeholder = st.empty()
+    chart_placeholder = st.empty()
+    league_rows = []
+    last_redraw = 0
     
-    for league_id in league_ids:
-        users = get_users(league_id)
-        league_data = get_league_data(league_id)
-        if users and league_data:
-            season = int(league_data.get('season', '0'))
-            for user in users:
-                user_id = user.get('user_id')
-                if user_id:
-                    if user_id not in manager_data or season > manager_data[user_id]['season']:
-                        manager_data[user_id] = {
-                            'display_name': user.get('display_name', 'Unknown'),
-                            'season': season
-                        }
+    for redraw, rows in enumerate(iter_user_performance(username)):
+        league_rows.append(rows)
+        if time.monotonic() - last_redraw < STREAM_REDRAW_INTERVAL:
+            continue
+        partial_df = pd.concat(league_rows, ignore_index=True).sort_values('Season', kind='stable')
+        if partial_df.empty:
+            continue
+        last_redraw = time.monotonic()
+        with summary_placeholder.container(), span('display_career_summary', rows=len(partial_df)):
+            display_career_summary(partial_df)
+        with chart_placeholder.container():
+            display_performance_chart(partial_df, username, key=f"streamed_performance_{redraw}")
     
-    return {uid: data['display_name'] for uid, data in manager_data.items()}
+    summary_placeholder.empty()
+    chart_placeholder.empty()
+    if not league_rows:
+        return None
+    return pd.concat(league_rows, ignore_index=True).sort_values('Season', kind='stable').reset_index(drop=True)
 
 # Main app
+serve_metrics_from_env()
+run_metrics = metrics.begin_run()
+trace = begin_run(st.sidebar.checkbox("Record trace", value=st.query_params.get('trace') == '1'))
 st.title("Historic Performance Analysis")
 
 username = st.text_input("Enter your Sleeper username:")
 
 if username:
-    #performance_df = get_user_performance(username)
-    performance_df = get_user_performance_optimized(username)
+    import pandas as pd
+    import requests
+    from components.performance_chart import display_performance_chart, display_comparison_chart
+    from components.head_to_head import display_head_to_head_summary
+    from components.matchup_table import display_matchup_table
+    from components.career_summary import display_career_summary
+    from utils.data_cache import (
+        get_user_performance_optimized,
+        analyze_head_to_head_optimized,
+        get_cached_head_to_head_history,
+        get_cached_league_standings,
+        get_manager_mapping,
+        refresh_live_week,
+        iter_user_performance
+    )
+    from utils.identity import identity_index
+    from utils.nfl_calendar import nfl_calendar
+    from utils.prefetch import start_prefetch
+    from utils.data_processing import create_rivalries_df, create_leaderboard_df
+    from utils.standings import get_owner_performance
+
+    # Read the NFL state in the background while leagues load; live refreshes need the week
+    nfl_calendar.current()
+
+    # Stream the first load for a username so early seasons show right away;
+    # later reruns read the warm caches directly
+    lookup_failed = False
+    try:
+        if st.session_state.get('streamed_username') != username:
+            with span('crawl', streamed=True):
+                performance_df = stream_user_performance(username)
+            st.session_state['streamed_username'] = username
+        else:
+            with span('crawl', streamed=False):
+                performance_df = get_user_performance_optimized(username)
+    except requests.RequestException as e:
+        # Sleeper couldn't answer the username lookup; that says nothing about whether it exists
+        print(f"Error looking up {username}: {e}")
+        performance_df, lookup_failed = None, True
+    
+    # In season, only live leagues' current weeks are revalidated; rebuild if anything moved
+    if performance_df is not None and not performance_df.empty:
+        if refresh_live_week(tuple(performance_df['league_id'])):
+            performance_df = get_user_performance_optimized(username)
+        
+        # Warm head-to-head data in the background while the summary is read
+        prefetch_job = start_prefetch(performance_df['league_id'])
+        with st.sidebar:
+            display_prefetch_status(prefetch_job)
 
 
     if performance_df is not None and not performance_df.empty:
@@ -199,7 +171,8 @@ if username:
                 (performance_df['Season'] <= year_range[1]) &
                 (performance_df['League'].isin(league_selections))
             ]
-            display_career_summary(filtered_df)
+            with span('display_career_summary', rows=len(filtered_df)):
+                display_career_summary(filtered_df)
             
             # Get managers only from selected leagues
             if not filtered_df.empty:
@@ -207,7 +180,7 @@ if username:
                 manager_mapping = get_manager_mapping(unique_league_ids)
                 
                 # Remove the current user from the manager options
-                user_id = get_user_id(username)
+                user_id = identity_index.resolve_username(username)
                 if user_id:
                     manager_mapping.pop(user_id, None)
                 
@@ -229,18 +202,13 @@ if username:
             )
             
             if selected_manager_id:
-                # Display comparison chart first
-                compare_df = get_user_performance(selected_manager_name)
-                if compare_df is not None and not compare_df.empty:
-                    compare_filtered = compare_df[
-                        (compare_df['Season'] >= year_range[0]) & 
-                        (compare_df['Season'] <= year_range[1]) &
-                        (compare_df['League'].isin(league_selections))
-                    ]
-                    
-                    if not compare_filtered.empty:
-                        display_comparison_chart(filtered_df, compare_filtered, 
-                                              username, selected_manager_name)
+                # Display comparison chart first, from the standings already built for these leagues
+                league_standings = get_cached_league_standings(tuple(filtered_df['league_id'].unique()))
+                compare_filtered = get_owner_performance(league_standings, selected_manager_id)
+                
+                if not compare_filtered.empty:
+                    display_comparison_chart(filtered_df, compare_filtered, 
+                                          username, selected_manager_name)
 
                 # Then display head-to-head analysis
                 h2h_df = analyze_head_to_head_optimized(
@@ -250,9 +218,38 @@ if username:
                 )
                 
                 if not h2h_df.empty:
-                    display_head_to_head_summary(username, selected_manager_name, h2h_df)
+                    with span('display_head_to_head_summary', games=len(h2h_df)):
+                        display_head_to_head_summary(username, selected_manager_name, h2h_df)
                     #display_matchup_table(h2h_df, username, selected_manager_name)
                 else:
                     st.warning(f"No head-to-head matchups found with {selected_manager_name}")
+
+        # Record against every opponent, from the same history the comparison uses
+        if not filtered_df.empty and user_id:
+            with span('rivalries'):
+                h2h_history = get_cached_head_to_head_history(tuple(filtered_df['league_id'].unique()), user_id)
+                rivalries_df = create_rivalries_df(h2h_history, manager_mapping)
+            if not rivalries_df.empty:
+                with st.expander("Rivalries"):
+                    st.dataframe(rivalries_df, use_container_width=True, hide_index=True)
+            
+            with span('leaderboard'):
+                leaderboard_df = create_leaderboard_df(
+                    get_cached_league_standings(tuple(filtered_df['league_id'].unique())),
+                    {**manager_mapping, user_id: username}
+                )
+            if not leaderboard_df.empty:
+                with st.expander("League Leaderboard"):
+                    st.dataframe(leaderboard_df, use_container_width=True, hide_index=True)
+    elif lookup_failed:
+        st.error("Couldn't reach Sleeper to look up this username. Please try again in a moment.")
     else:
-        st.error("No leagues found for this username or the username doesn't exist.")
\ No newline at end of file
+        st.error("No leagues found for this username or the username doesn't exist.")
+else:
+    # Load pandas and plotly while the username is typed
+    warm_imports()
+
+display_debug_info(run_metrics)
+if trace is not None:
+    display_trace_export(trace)
+    begin_run(False)  # The script thread is reused; stop collecting until the next traced run
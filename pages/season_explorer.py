@@ -1,11 +1,4 @@
 import streamlit as st
-from utils.api import (
-    get_user_id,
-    get_user_leagues,
-    get_league_data,
-    get_users,
-    get_rosters,
-)
 
 
 # Username input section
@@ -13,6 +6,8 @@ st.header("This is QUITE the broken page, don't bother")
 username = st.text_input("Enter your Sleeper username:", key="username_input")
 
 if username:
+    from utils.api import get_user_id, get_user_leagues, get_users, get_rosters
+
     # First get the user ID
     user_id = get_user_id(username)
     
@@ -0,0 +1,9 @@
+# tests/conftest.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.headless import quiet_streamlit_logger
+
+quiet_streamlit_logger()
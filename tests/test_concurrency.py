@@ -0,0 +1,90 @@
+# tests/test_concurrency.py
+import threading
+import time
+
+import pytest
+
+from utils.concurrency import SingleFlight, run_parallel
+
+
+def _run_together(single_flight, key, fn, callers):
+    """Call single_flight.do from several threads while the leader's fn is still running"""
+    results = [None] * callers
+    threads = [
+        threading.Thread(target=lambda i=i: results.__setitem__(i, _outcome(single_flight, key, fn)))
+        for i in range(callers)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def _wait_for_followers(single_flight, count, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while single_flight.coalesced < count:
+        assert time.monotonic() < deadline, "callers never coalesced"
+        time.sleep(0.001)
+
+
+def _outcome(single_flight, key, fn):
+    try:
+        return single_flight.do(key, fn)
+    except Exception as e:
+        return e
+
+
+def test_concurrent_callers_share_one_call():
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {'value': 42}
+
+    threads, results = _run_together(single_flight, 'key', fetch, 5)
+    _wait_for_followers(single_flight, 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.coalesced == 4
+
+
+def test_exception_reaches_every_waiter_and_is_not_kept():
+    single_flight = SingleFlight()
+    release = threading.Event()
+    error = ValueError("upstream failed")
+
+    def fail():
+        release.wait(5)
+        raise error
+
+    threads, results = _run_together(single_flight, 'key', fail, 3)
+    _wait_for_followers(single_flight, 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert all(result is error for result in results)
+    # Nothing is cached: the next call runs again
+    assert single_flight.do('key', lambda: 'recovered') == 'recovered'
+
+
+def test_different_keys_do_not_coalesce():
+    single_flight = SingleFlight()
+    assert single_flight.do('a', lambda: 1) == 1
+    assert single_flight.do('b', lambda: 2) == 2
+    assert single_flight.coalesced == 0
+
+
+def test_run_parallel_keeps_task_order_and_raises():
+    assert run_parallel([lambda i=i: i * i for i in range(10)]) == [i * i for i in range(10)]
+
+    def boom():
+        raise KeyError('missing')
+    with pytest.raises(KeyError):
+        run_parallel([lambda: 1, boom])
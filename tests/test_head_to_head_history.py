@@ -0,0 +1,74 @@
+# tests/test_head_to_head_history.py
+import pandas as pd
+
+from utils.data_cache import MATCHUP_COLUMNS, _league_head_to_head
+
+USER_ID = 'user'
+OPPONENT_ID = 'opponent'
+PLAYOFF_WEEK_START = 15
+
+
+def _matchup_table(rows):
+    return pd.DataFrame(rows, columns=MATCHUP_COLUMNS).set_index('roster_id').sort_index()
+
+
+def _league_info(bracket):
+    return {
+        'league_data': {'season': '2025', 'name': "Test League",
+                        'settings': {'playoff_week_start': PLAYOFF_WEEK_START}},
+        'rosters': [{'roster_id': 1, 'owner_id': USER_ID}, {'roster_id': 2, 'owner_id': OPPONENT_ID}],
+        'playoff_bracket': bracket
+    }
+
+
+def _regular_season():
+    return [
+        row
+        for week in range(1, PLAYOFF_WEEK_START)
+        for row in ((week, 1, 1, 100.0 + week), (week, 2, 1, 90.0))
+    ]
+
+
+def test_regular_season_and_playoff_games():
+    table = _matchup_table(_regular_season() + [(15, 1, None, 120.0), (15, 2, None, 130.0)])
+    bracket = [{'r': 1, 'm': 1, 't1': 1, 't2': 2, 'w': 2, 'l': 1}]
+
+    history = _league_head_to_head('league', _league_info(bracket), table, USER_ID)
+
+    assert len(history) == PLAYOFF_WEEK_START
+    playoffs = history[history['Type'] == 'Playoffs']
+    assert playoffs[['Week', 'Result', 'opponent_id']].values.tolist() == [["First Round", 'Loss', OPPONENT_ID]]
+
+
+def test_open_bracket_slot_is_skipped():
+    # A top seed with a bye: the user's only bracket entry has no opponent yet
+    table = _matchup_table(_regular_season() + [(16, 1, None, 0.0), (16, 2, None, 0.0)])
+    bracket = [
+        {'r': 2, 'm': 3, 't1': 1, 't2': None},
+        {'r': 3, 'm': 5, 't1': {'w': 3}, 't2': {'w': 4}}
+    ]
+
+    history = _league_head_to_head('league', _league_info(bracket), table, USER_ID)
+
+    assert len(history) == PLAYOFF_WEEK_START - 1
+    assert set(history['Type']) == {'Regular Season'}
+
+
+def test_bracket_reference_opponent_is_skipped():
+    # The user's slot is decided but the opponent is still "winner of match 2"
+    table = _matchup_table(_regular_season())
+    bracket = [{'r': 2, 'm': 3, 't1': {'w': 2}, 't2': 1}]
+
+    history = _league_head_to_head('league', _league_info(bracket), table, USER_ID)
+
+    assert (history['Type'] == 'Regular Season').all()
+
+
+def test_game_in_progress_is_left_out():
+    # Week 14 is live: the opponent has scored, the user's players haven't played yet
+    table = _matchup_table([row for row in _regular_season() if row[0] < 14] + [(14, 1, 1, 0.0), (14, 2, 1, 85.0)])
+
+    history = _league_head_to_head('league', _league_info([]), table, USER_ID)
+
+    assert len(history) == 13
+    assert 14 not in history['week'].values
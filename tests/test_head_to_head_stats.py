@@ -0,0 +1,88 @@
+# tests/test_head_to_head_stats.py
+import pandas as pd
+import pytest
+
+from utils.head_to_head import MARGIN_LABELS, compute_head_to_head_stats
+
+
+def _games(*games):
+    """games: (season, week, user score, opponent score[, type]) in any order"""
+    rows = []
+    for season, week, user_score, opponent_score, *game_type in games:
+        result = 'Win' if user_score > opponent_score else 'Loss' if user_score < opponent_score else 'Tie'
+        rows.append({'Season': season, 'Week': week, 'week': week, 'User Score': user_score,
+                     'Opponent Score': opponent_score, 'Result': result,
+                     'Type': game_type[0] if game_type else 'Regular Season'})
+    return pd.DataFrame(rows, columns=['Season', 'Week', 'week', 'User Score', 'Opponent Score', 'Result', 'Type'])
+
+
+@pytest.mark.parametrize('games, expected', [
+    # Streaks are read in calendar order, not row order
+    (_games((2024, 3, 100, 90), (2023, 5, 80, 95), (2024, 1, 110, 100), (2023, 2, 70, 75)),
+     {'current_streak': 'W2', 'longest_win_streak': 2, 'longest_loss_streak': 2}),
+    (_games((2023, 1, 100, 90), (2023, 2, 100, 90), (2023, 3, 100, 90), (2024, 1, 80, 90)),
+     {'current_streak': 'L1', 'longest_win_streak': 3, 'longest_loss_streak': 1}),
+    (_games((2023, 1, 100, 100), (2023, 2, 90, 100)),
+     {'current_streak': 'L1', 'ties': 1, 'longest_win_streak': 0}),
+    # A playoff round (week 15) comes after the regular season week 14
+    (_games((2023, 15, 90, 100, 'Playoffs'), (2023, 14, 100, 90)),
+     {'current_streak': 'L1', 'longest_win_streak': 1}),
+])
+def test_totals_and_streaks(games, expected):
+    stats = compute_head_to_head_stats(games)
+
+    assert stats.meetings == len(games)
+    assert stats.wins + stats.losses + stats.ties == stats.meetings
+    for field, value in expected.items():
+        assert getattr(stats, field) == value, field
+
+
+@pytest.mark.parametrize('games, avg_for, avg_against, avg_margin, largest_win, largest_loss', [
+    (_games((2023, 1, 120, 100), (2023, 2, 90, 100), (2023, 3, 150, 90)), 120.0, 96.7, 23.3, 60.0, 10.0),
+    (_games((2023, 1, 100, 120), (2023, 2, 95.5, 100)), 97.8, 110.0, -12.2, 0.0, 20.0),
+    (_games((2023, 1, 100, 100)), 100.0, 100.0, 0.0, 0.0, 0.0),
+])
+def test_scoring_and_margins(games, avg_for, avg_against, avg_margin, largest_win, largest_loss):
+    stats = compute_head_to_head_stats(games)
+
+    assert (stats.avg_points_for, stats.avg_points_against, stats.avg_margin) == (avg_for, avg_against, avg_margin)
+    assert (stats.largest_win, stats.largest_loss) == (largest_win, largest_loss)
+
+
+def test_margin_buckets():
+    stats = compute_head_to_head_stats(_games(
+        (2023, 1, 105, 100), (2023, 2, 130, 100), (2023, 3, 100, 160), (2023, 4, 90, 100), (2023, 5, 100, 100)
+    ))
+
+    assert stats.margins['Margin'].tolist() == MARGIN_LABELS
+    # Bucket edges belong to the lower bucket; the tie is in no column
+    assert stats.margins[['Wins', 'Losses']].values.tolist() == [[1, 1], [0, 0], [1, 0], [0, 1]]
+
+
+def test_season_records_newest_first():
+    stats = compute_head_to_head_stats(_games(
+        (2022, 1, 100, 90), (2024, 1, 80, 90), (2024, 2, 110, 90), (2022, 2, 100.04, 100.04)
+    ))
+
+    assert stats.seasons.values.tolist() == [
+        [2024, 1, 1, 0, 190.0, 180.0],
+        [2022, 1, 0, 1, 200.0, 190.0],
+    ]
+
+
+def test_regular_season_and_playoff_splits():
+    stats = compute_head_to_head_stats(_games(
+        (2023, 1, 100, 90), (2023, 2, 80, 90), (2023, 15, 120, 110, 'Playoffs'), (2024, 16, 95, 105, 'Playoffs')
+    ))
+    splits = stats.splits.set_index('Type')
+
+    assert splits.loc['Regular Season', ['Meetings', 'Wins', 'Losses', 'Ties']].tolist() == [2, 1, 1, 0]
+    assert splits.loc['Playoffs', ['Meetings', 'Wins', 'Losses', 'Ties']].tolist() == [2, 1, 1, 0]
+    assert splits.loc['Playoffs', 'Avg Points For'] == 107.5
+
+
+def test_no_games():
+    stats = compute_head_to_head_stats(_games())
+
+    assert (stats.meetings, stats.current_streak, stats.avg_margin) == (0, '', 0.0)
+    assert stats.seasons.empty and stats.splits.empty
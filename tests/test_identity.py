@@ -0,0 +1,89 @@
+# tests/test_identity.py
+import pytest
+import requests
+
+import utils.api as api
+import utils.identity as identity
+from utils.identity import IdentityIndex
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class FakeClient:
+    """Answers each GET with the next outcome in line: a FakeResponse, or an exception to raise"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get(self, url, priority=None, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def index(tmp_path):
+    return IdentityIndex(str(tmp_path / 'identity.sqlite3'))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    def install(*outcomes):
+        fake = FakeClient(*outcomes)
+        monkeypatch.setattr(api, 'get_client', lambda: fake)
+        return fake
+    return install
+
+
+def test_known_username_is_resolved_once(index, client):
+    fake = client(FakeResponse(200, {'user_id': '123', 'username': 'someone'}))
+
+    assert index.resolve_username('Someone') == '123'
+    assert index.resolve_username('someone ') == '123'
+    assert fake.calls == 1
+
+
+def test_unknown_username_is_remembered(index, client):
+    fake = client(FakeResponse(200, None))
+
+    assert index.resolve_username('nobody') is None
+    assert index.resolve_username('nobody') is None
+    assert fake.calls == 1
+
+
+@pytest.mark.parametrize('failure', [
+    requests.ConnectTimeout("timed out"),
+    requests.ConnectionError("connection refused"),
+    FakeResponse(503),
+    FakeResponse(429),  # Still rate limited after the client's retries
+])
+def test_failed_lookup_is_not_taken_for_a_missing_user(index, client, failure):
+    fake = client(failure, FakeResponse(200, {'user_id': '123'}))
+
+    with pytest.raises(requests.RequestException):
+        index.resolve_username('someone')
+    # Once Sleeper recovers the username resolves, rather than being cached as not found
+    assert index.resolve_username('someone') == '123'
+    assert fake.calls == 2
+
+
+def test_lookup_failure_keeps_the_previous_answer_uncached(index, client, monkeypatch):
+    client(FakeResponse(200, {'user_id': '123'}), requests.ReadTimeout("slow"), FakeResponse(200, {'user_id': '123'}))
+    assert index.resolve_username('someone') == '123'
+
+    # The daily recheck fails; the stored answer is left for the next attempt
+    later = identity.time.time() + identity.USERNAME_TTL + 1
+    monkeypatch.setattr(identity.time, 'time', lambda: later)
+    with pytest.raises(requests.RequestException):
+        index.resolve_username('someone')
+    assert index.resolve_username('someone') == '123'
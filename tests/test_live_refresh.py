@@ -0,0 +1,78 @@
+# tests/test_live_refresh.py
+import time
+
+import pytest
+import streamlit as st
+
+import utils.data_cache as data_cache
+from utils.api import ConditionalResponse
+from utils.nfl_calendar import NflWeek
+from utils.response_store import LIVE_TTL, NEVER_EXPIRES, ResponseStore
+
+LEAGUE_ID = 'live'
+
+
+class FakeClient:
+    """Serves Sleeper paths from a dict, answering 304 when the caller's ETag still matches"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def get_json_conditional(self, path, validators=None, priority=None):
+        self.calls.append(path)
+        value = self.responses.get(path)
+        etag = str(hash(repr(value)))
+        if validators and validators.get('etag') == etag:
+            return ConditionalResponse(None, validators, True)
+        return ConditionalResponse(value, {'etag': etag}, False)
+
+
+def _matchups(points):
+    return [{'roster_id': 1, 'matchup_id': 1, 'points': points},
+            {'roster_id': 2, 'matchup_id': 1, 'points': 90.0}]
+
+
+@pytest.fixture
+def live_league(tmp_path, monkeypatch):
+    store = ResponseStore(str(tmp_path / 'responses.sqlite3'))
+    league = {'league_id': LEAGUE_ID, 'status': 'in_season', 'season': '2025', 'name': "Live",
+              'settings': {'leg': 5, 'playoff_week_start': 15}}
+    client = FakeClient({
+        f"league/{LEAGUE_ID}": league,
+        f"league/{LEAGUE_ID}/rosters": [],
+        f"league/{LEAGUE_ID}/winners_bracket": [],
+        **{f"league/{LEAGUE_ID}/matchups/{week}": _matchups(100.0) for week in range(1, 6)}
+    })
+    monkeypatch.setattr(data_cache, 'response_store', store)
+    monkeypatch.setattr(data_cache, 'get_client', lambda: client)
+    monkeypatch.setattr(data_cache.nfl_calendar, 'current', lambda: NflWeek('2025', 'regular', 5, '2025', 'sleeper'))
+    st.cache_data.clear()
+    yield store, client
+    st.cache_data.clear()
+
+
+def test_matchups_ttl():
+    live = {'status': 'in_season', 'settings': {'leg': 5}}
+    assert data_cache._matchups_ttl(live, 3) is NEVER_EXPIRES
+    assert data_cache._matchups_ttl(live, 4) == LIVE_TTL  # Stat corrections still land
+    assert data_cache._matchups_ttl(live, 5) == LIVE_TTL
+    assert data_cache._matchups_ttl({'status': 'complete', 'settings': {'leg': 5}}, 4) is NEVER_EXPIRES
+
+
+def test_previous_week_stat_correction_is_picked_up(live_league, monkeypatch):
+    store, client = live_league
+    for week in range(1, 6):
+        assert data_cache.get_cached_matchups(LEAGUE_ID, week)[0]['points'] == 100.0
+
+    # Week 4 is rescored after the fact, and the stored copies expire
+    client.responses[f"league/{LEAGUE_ID}/matchups/4"] = _matchups(104.0)
+    later = time.time() + LIVE_TTL + 1
+    monkeypatch.setattr(time, 'time', lambda: later)
+    client.calls.clear()
+
+    assert data_cache.refresh_live_week((LEAGUE_ID,)) is True
+    assert store.get('matchups', LEAGUE_ID, 4)[0]['points'] == 104.0
+    assert data_cache.get_cached_matchups(LEAGUE_ID, 4)[0]['points'] == 104.0
+    # Final weeks are never asked for again
+    assert not any(call.endswith(('/matchups/1', '/matchups/2', '/matchups/3')) for call in client.calls)
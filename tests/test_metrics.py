@@ -0,0 +1,43 @@
+# tests/test_metrics.py
+import contextvars
+import threading
+
+from utils.concurrency import run_parallel
+from utils.metrics import MetricsRegistry
+
+
+def test_run_counts_its_own_work_and_its_workers():
+    registry = MetricsRegistry()
+    run = registry.begin_run()
+
+    registry.record_call('league/{id}', 200, 12.0, 100)
+    run_parallel([lambda: registry.record_call('league/{id}/users', 200, 5.0, 10) for _ in range(3)])
+    registry.record_cache('memory/league_info', hit=True)
+    registry.cache_miss('memory/league_info')
+
+    snapshot = run.snapshot()
+    assert snapshot['endpoints']['league/{id}']['calls'] == 1
+    assert snapshot['endpoints']['league/{id}/users']['calls'] == 3
+    assert snapshot['caches']['memory/league_info'] == {'hits': 0, 'misses': 1}
+
+
+def test_run_excludes_other_sessions_and_background_threads():
+    registry = MetricsRegistry()
+    run = registry.begin_run()
+
+    # A background thread starts with an empty context; another session has its own run
+    background = threading.Thread(target=lambda: registry.record_call('players/nfl', 200, 50.0, 10 ** 6))
+    background.start()
+    background.join()
+
+    def other_session():
+        registry.begin_run()
+        registry.record_call('state/nfl', 200, 3.0, 10)
+    contextvars.Context().run(other_session)
+
+    registry.record_call('league/{id}', 304, 8.0)
+
+    assert list(run.snapshot()['endpoints']) == ['league/{id}']
+    assert run.snapshot()['endpoints']['league/{id}']['not_modified'] == 1
+    # The process totals still see everything
+    assert set(registry.snapshot()['endpoints']) == {'players/nfl', 'state/nfl', 'league/{id}'}
@@ -0,0 +1,76 @@
+# tests/test_nfl_calendar.py
+from datetime import date, timedelta
+
+import pytest
+
+import utils.api as api
+from utils.nfl_calendar import NflCalendar, _from_sleeper_state, schedule_week, season_schedule
+
+
+@pytest.mark.parametrize('season, regular_weeks, preseason_weeks', [(2019, 17, 4), (2021, 18, 3), (2025, 18, 3)])
+def test_season_shape(season, regular_weeks, preseason_weeks):
+    weeks = season_schedule(season)
+    by_type = {season_type: [w.week for w in weeks if w.season_type == season_type]
+               for season_type in ('pre', 'regular', 'post')}
+
+    assert by_type['pre'] == list(range(1, preseason_weeks + 1))
+    assert by_type['regular'] == list(range(1, regular_weeks + 1))
+    assert by_type['post'] == list(range(regular_weeks + 1, regular_weeks + 5))
+    # Contiguous Tuesday-to-Tuesday weeks
+    assert all(previous.end == week.start for previous, week in zip(weeks, weeks[1:]))
+    assert all(week.start.weekday() == 1 for week in weeks)
+
+
+@pytest.mark.parametrize('season, opener', [(2023, date(2023, 9, 7)), (2024, date(2024, 9, 5)),
+                                            (2025, date(2025, 9, 4))])
+def test_week_one_holds_the_opener(season, opener):
+    week_one = next(w for w in season_schedule(season) if w.season_type == 'regular')
+    assert week_one.start <= opener < week_one.end
+
+
+def test_super_bowl_week_includes_the_bye():
+    super_bowl = season_schedule(2024)[-1]
+    assert (super_bowl.end - super_bowl.start) == timedelta(weeks=2)
+    assert super_bowl.start <= date(2025, 2, 9) < super_bowl.end
+
+
+@pytest.mark.parametrize('day, expected', [
+    (date(2024, 11, 25), ('2024', 'regular', 12)),
+    (date(2025, 1, 12), ('2024', 'post', 19)),
+    (date(2025, 3, 1), ('2024', 'off', 0)),
+    (date(2025, 8, 20), ('2025', 'pre', 2)),
+    (date(2020, 12, 1), ('2020', 'regular', 13)),
+])
+def test_schedule_week(day, expected):
+    assert tuple(schedule_week(day)[:3]) == expected
+    assert schedule_week(day).source == 'schedule'
+
+
+def test_league_season_moves_ahead_in_the_offseason():
+    assert schedule_week(date(2025, 3, 1)).league_season == '2025'
+    assert schedule_week(date(2024, 11, 25)).league_season == '2024'
+
+
+def test_sleeper_state_parsing():
+    assert _from_sleeper_state({'season': '2025', 'season_type': 'regular', 'week': 7})[:3] == ('2025', 'regular', 7)
+    assert _from_sleeper_state({'season': '2025', 'season_type': 'off', 'week': None}).week == 0
+    assert _from_sleeper_state({'season': '2025', 'season_type': 'unknown', 'week': 1}) is None
+    assert _from_sleeper_state(None) is None
+    off = _from_sleeper_state({'season': '2024', 'league_season': '2025', 'season_type': 'off', 'week': 0})
+    assert (off.season, off.league_season) == ('2024', '2025')
+    assert _from_sleeper_state({'season': '2025', 'season_type': 'regular', 'week': 3}).league_season == '2025'
+
+
+def test_refresh_reads_the_state_every_time(monkeypatch):
+    # Each refresh goes to Sleeper, so a week rollover is seen on the very next one
+    states = iter([{'season': '2025', 'season_type': 'regular', 'week': 7},
+                   {'season': '2025', 'season_type': 'regular', 'week': 8},
+                   None])
+    monkeypatch.setattr(api, 'get_nfl_state', lambda: next(states))
+    calendar = NflCalendar()
+
+    assert calendar.refresh().week == 7
+    assert calendar.refresh().week == 8
+    # A failed read keeps the last answer
+    assert calendar.refresh() is None
+    assert calendar.current()[:3] == ('2025', 'regular', 8)
@@ -0,0 +1,45 @@
+# tests/test_players.py
+import json
+import random
+
+import pytest
+
+from utils.players import _iter_object_items
+
+PLAYERS = {
+    '4046': {'full_name': "Patrick Mahomes", 'position': 'QB', 'team': 'KC', 'number': 15,
+             'injury': None, 'active': True, 'fantasy_positions': ['QB']},
+    '96': {'first_name': "A {brace}, \"quoted\": name", 'last_name': "O'Neil", 'years_exp': 12345},
+    'DEF': 123456789,
+    'score': -12.5e3,
+    'flag': False,
+    'missing': None,
+    'nested': {'a': [1, [2, {'b': 3}]], 'c': {}}
+}
+
+
+def _split(text, rng, pieces):
+    cuts = sorted(rng.sample(range(1, len(text)), pieces))
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+def test_whole_object_in_one_chunk():
+    assert dict(_iter_object_items([json.dumps(PLAYERS)])) == PLAYERS
+
+
+def test_number_split_across_chunks():
+    assert list(_iter_object_items(['{"a": 12', '345, "b": 1}'])) == [('a', 12345), ('b', 1)]
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+def test_random_chunk_splits(indent):
+    text = json.dumps(PLAYERS, indent=indent)
+    rng = random.Random(7)
+    for _ in range(500):
+        chunks = _split(text, rng, rng.randint(1, 40))
+        assert list(_iter_object_items(chunks)) == list(PLAYERS.items()), chunks
+
+
+def test_single_character_chunks():
+    text = json.dumps(PLAYERS)
+    assert list(_iter_object_items(list(text))) == list(PLAYERS.items())
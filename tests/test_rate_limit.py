@@ -0,0 +1,78 @@
+# tests/test_rate_limit.py
+import threading
+import time
+
+from utils.rate_limit import BACKGROUND, DEFAULT, INTERACTIVE, PriorityRateLimiter, request_priority
+
+
+def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _queue(limiter, priority, granted):
+    """Start a thread that waits for a token and records its priority once granted"""
+    queued = limiter.metrics()['queued']
+    thread = threading.Thread(target=lambda: (limiter.acquire(priority), granted.append(priority)))
+    thread.start()
+    _wait_until(lambda: limiter.metrics()['queued'] == queued + 1)
+    return thread
+
+
+def test_burst_is_granted_without_waiting():
+    limiter = PriorityRateLimiter(requests_per_minute=60, burst=3)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire(DEFAULT)
+    assert time.monotonic() - start < 0.05
+
+
+def test_waiters_are_served_by_priority_then_arrival():
+    limiter = PriorityRateLimiter(requests_per_minute=600, burst=1)
+    limiter.acquire(DEFAULT)  # Empty the bucket so everyone below has to queue
+    granted = []
+    threads = [
+        _queue(limiter, BACKGROUND, granted),
+        _queue(limiter, DEFAULT, granted),
+        _queue(limiter, INTERACTIVE, granted),
+        _queue(limiter, INTERACTIVE, granted),
+    ]
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert granted == [INTERACTIVE, INTERACTIVE, DEFAULT, BACKGROUND]
+    stats = limiter.metrics()['priorities']
+    assert stats['interactive']['granted'] == 2
+    assert stats['background']['waited'] == 1
+
+
+def test_throttle_holds_every_caller_back():
+    limiter = PriorityRateLimiter(requests_per_minute=60000, burst=10)
+    limiter.throttle(0.2)
+    start = time.monotonic()
+    limiter.acquire(INTERACTIVE)
+    assert time.monotonic() - start >= 0.19
+    assert limiter.metrics()['throttled'] == 1
+
+
+def test_priority_defaults_to_the_callers_context():
+    limiter = PriorityRateLimiter(requests_per_minute=60, burst=5)
+    with request_priority(BACKGROUND):
+        limiter.acquire()
+    limiter.acquire()
+    stats = limiter.metrics()['priorities']
+    assert stats['background']['granted'] == 1
+    assert stats['default']['granted'] == 1
+
+
+def test_configure_refills_and_wakes_waiters():
+    limiter = PriorityRateLimiter(requests_per_minute=1, burst=1)
+    limiter.acquire(DEFAULT)  # The next token is a minute away
+    granted = []
+    thread = _queue(limiter, DEFAULT, granted)
+    limiter.configure(requests_per_minute=60000, burst=5)
+    thread.join(timeout=2)
+    assert granted == [DEFAULT]
+    assert limiter.burst == 5
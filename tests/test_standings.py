@@ -0,0 +1,110 @@
+# tests/test_standings.py
+from utils.standings import compute_standings, create_rosters_df, get_owner_performance
+
+
+def _league_info(rosters, status='complete', winner_roster_id=None):
+    """rosters: (roster_id, owner_id, wins, losses, fpts, fpts_decimal) in the league's roster order"""
+    return {
+        'league_data': {'status': status, 'metadata': {'latest_league_winner_roster_id': winner_roster_id}},
+        'rosters': [
+            {'roster_id': roster_id, 'owner_id': owner_id,
+             'settings': {'wins': wins, 'losses': losses, 'fpts': fpts, 'fpts_decimal': fpts_decimal}}
+            for roster_id, owner_id, wins, losses, fpts, fpts_decimal in rosters
+        ]
+    }
+
+
+def _standings(*leagues):
+    return compute_standings(create_rosters_df(
+        (2025, f"League {i}", f"league{i}", league_info) for i, league_info in enumerate(leagues)
+    ))
+
+
+def _standing_by_owner(standings):
+    return dict(zip(standings['owner_id'], standings['Standing']))
+
+
+def test_wins_rank_before_points():
+    standings = _standings(_league_info([
+        (1, 'a', 5, 9, 1800, 0),
+        (2, 'b', 9, 5, 1500, 0),
+        (3, 'c', 7, 7, 1900, 0),
+    ]))
+
+    assert _standing_by_owner(standings) == {'b': 1, 'c': 2, 'a': 3}
+
+
+def test_points_break_a_wins_tie_including_the_decimal():
+    standings = _standings(_league_info([
+        (1, 'a', 8, 6, 1600, 10),  # 1600.10
+        (2, 'b', 8, 6, 1600, 90),  # 1600.90
+        (3, 'c', 8, 6, 1599, 99),
+    ]))
+
+    assert _standing_by_owner(standings) == {'b': 1, 'a': 2, 'c': 3}
+    assert standings.set_index('owner_id').loc['b', 'fpts'] == 1600.9
+
+
+def test_roster_order_breaks_a_full_tie():
+    standings = _standings(_league_info([
+        (4, 'd', 7, 7, 1500, 50),
+        (2, 'b', 7, 7, 1500, 50),
+        (3, 'c', 7, 7, 1500, 50),
+    ]))
+
+    assert _standing_by_owner(standings) == {'d': 1, 'b': 2, 'c': 3}
+
+
+def test_leagues_are_ranked_independently():
+    standings = _standings(
+        _league_info([(1, 'a', 10, 4, 1700, 0), (2, 'b', 4, 10, 1300, 0)]),
+        _league_info([(1, 'a', 3, 11, 1200, 0), (2, 'b', 11, 3, 1800, 0)])
+    )
+
+    assert standings[['league_id', 'owner_id', 'Standing', 'Total Teams']].values.tolist() == [
+        ['league0', 'a', 1, 2], ['league0', 'b', 2, 2],
+        ['league1', 'a', 2, 2], ['league1', 'b', 1, 2],
+    ]
+
+
+def test_finish_flags_in_a_large_league():
+    # Ten teams: owner i finishes i-th
+    standings = _standings(_league_info([
+        (i, f"owner{i}", 14 - i, i, 1500, 0) for i in range(1, 11)
+    ], winner_roster_id='3')).set_index('owner_id')
+
+    assert standings['Is Regular Season Winner'][standings['Is Regular Season Winner']].index.tolist() == ['owner1']
+    assert standings['Is Last'][standings['Is Last']].index.tolist() == ['owner10']
+    assert standings['In Top 6'].sum() == 6 and standings.loc['owner6', 'In Top 6']
+    assert standings['In Bottom 4'].sum() == 4 and standings.loc['owner7', 'In Bottom 4']
+    assert standings['Is Champion'][standings['Is Champion']].index.tolist() == ['owner3']
+    assert standings.loc['owner1', 'Games Above 500'] == 12
+
+
+def test_small_league_playoff_flags_scale_with_size():
+    # Four teams: the top three make the playoff cut, the bottom two count as bottom
+    standings = _standings(_league_info([
+        (i, f"owner{i}", 10 - i, i, 1500, 0) for i in range(1, 5)
+    ])).set_index('owner_id')
+
+    assert standings['In Top 6'].tolist() == [True, True, True, False]
+    assert standings['In Bottom 4'].tolist() == [False, False, True, True]
+
+
+def test_champion_needs_a_completed_league():
+    in_progress = _standings(_league_info([(1, 'a', 9, 5, 1600, 0), (2, 'b', 5, 9, 1400, 0)],
+                                          status='in_season', winner_roster_id='1'))
+    no_winner = _standings(_league_info([(1, 'a', 9, 5, 1600, 0), (2, 'b', 5, 9, 1400, 0)]))
+
+    assert not in_progress['Is Champion'].any()
+    assert not no_winner['Is Champion'].any()
+
+
+def test_owner_performance_rows():
+    standings = _standings(_league_info([(1, 'a', 9, 5, 1600, 0), (2, 'b', 5, 9, 1400, 0)], winner_roster_id='2'))
+
+    performance = get_owner_performance(standings, 'b')
+
+    assert performance[['Standing', 'Games Above 500', 'Is Champion', 'Is Last']].values.tolist() == [
+        [2, -4, True, True]
+    ]
@@ -0,0 +1,78 @@
+# tests/test_user_seasons.py
+import pytest
+
+import utils.api as api
+import utils.data_cache as data_cache
+from utils.nfl_calendar import NflWeek
+from utils.response_store import LIVE_TTL, NEVER_EXPIRES
+
+
+def _league(league_id, previous_league_id=None, status='complete'):
+    return {'league_id': league_id, 'previous_league_id': previous_league_id, 'status': status}
+
+
+@pytest.fixture
+def user_leagues(monkeypatch):
+    """Serve iter_user_seasons from a {season: leagues} dict and record the seasons asked for"""
+    seasons = {}
+    calls = []
+
+    def get_cached_user_leagues(user_id, season=None):
+        calls.append(int(season))
+        return seasons.get(int(season)) or None
+
+    monkeypatch.setattr(data_cache, 'get_cached_user_leagues', get_cached_user_leagues)
+    monkeypatch.setattr(data_cache, '_current_seasons', lambda: [2025])
+    return seasons, calls
+
+
+def test_lineage_is_followed_back(user_leagues):
+    seasons, calls = user_leagues
+    seasons.update({
+        2025: [_league('l2025', 'l2024', status='in_season')],
+        2024: [_league('l2024', 'l2023')],
+        2023: [_league('l2023')]
+    })
+
+    assert [season for season, _ in data_cache.iter_user_seasons('user')] == [2025, 2024, 2023]
+
+
+def test_broken_lineage_still_finds_older_seasons(user_leagues):
+    seasons, calls = user_leagues
+    # A new league without a previous_league_id, and an older lineage that ended in 2022
+    seasons[2025] = [_league('new', status='in_season')]
+    for season in range(2019, 2023):
+        seasons[season] = [_league(f"old{season}", f"old{season - 1}" if season > 2019 else None)]
+
+    found = [season for season, _ in data_cache.iter_user_seasons('user')]
+
+    assert found == [2025, 2022, 2021, 2020, 2019]
+    assert sorted(calls) == list(range(data_cache.EARLIEST_SEASON, 2026))
+
+
+def test_user_without_current_leagues(user_leagues):
+    seasons, calls = user_leagues
+    seasons[2017] = [_league('l2017')]
+
+    assert [season for season, _ in data_cache.iter_user_seasons('user')] == [2017]
+    assert len(calls) == len(set(calls))  # Every season is probed at most once
+
+
+def test_empty_past_season_never_expires(monkeypatch):
+    monkeypatch.setattr(data_cache, '_current_seasons', lambda: [2025])
+
+    assert data_cache._user_leagues_ttl([], '2019') is NEVER_EXPIRES
+    assert data_cache._user_leagues_ttl(None, '2024') is NEVER_EXPIRES
+    assert data_cache._user_leagues_ttl([], '2025') == LIVE_TTL
+    assert data_cache._user_leagues_ttl([_league('l', status='in_season')], '2025') == LIVE_TTL
+    assert data_cache._user_leagues_ttl([_league('l')], '2024') is NEVER_EXPIRES
+
+
+def test_current_seasons_come_from_the_calendar(monkeypatch):
+    def unreachable():
+        raise AssertionError("the NFL state must not be fetched on the script thread")
+    monkeypatch.setattr(api, 'get_nfl_state', unreachable)
+    monkeypatch.setattr(data_cache.nfl_calendar, 'current',
+                        lambda: NflWeek('2024', 'off', 0, '2025', 'sleeper'))
+
+    assert data_cache._current_seasons() == [2024, 2025]
@@ -1,12 +1,163 @@
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from utils.metrics import endpoint_name, metrics
+from utils.rate_limit import INTERACTIVE, rate_limiter
+from utils.tracing import span
+from utils.transport import LIVE, mount_transport
+
+# Point at a local stand-in (python -m utils.transport) to run without the live API
+BASE_URL = os.environ.get('SLEEPER_BASE_URL', "https://api.sleeper.app/v1")
+
+POOL_SIZE = 16  # Max keep-alive connections held open to the Sleeper host
+CONNECT_TIMEOUT = 3.05  # Seconds to establish a TCP/TLS connection
+READ_TIMEOUT = 15  # Seconds to wait between bytes of a response
+MAX_RETRIES = 3  # Attempts after a 429 before giving up on a call
+
+
+class ConditionalResponse(NamedTuple):
+    value: object
+    validators: Optional[dict]
+    not_modified: bool
+
+
+class SleeperClient:
+    """Shared HTTP client for the Sleeper API over one pooled keep-alive session"""
+
+    def __init__(self, pool_size=POOL_SIZE, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 transport=None, fixture=None, replay_latency=None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self._in_flight = threading.BoundedSemaphore(pool_size)
+        # Streamed bodies hold their connection past get(); wait for one rather than open an extra
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Transport settings default to the SLEEPER_* variables documented in utils.transport
+        self.transport = mount_transport(
+            self.session,
+            BASE_URL,
+            transport or os.environ.get('SLEEPER_TRANSPORT', LIVE),
+            fixture or os.environ.get('SLEEPER_FIXTURE'),
+            (replay_latency if replay_latency is not None
+             else float(os.environ.get('SLEEPER_REPLAY_LATENCY_MS', 0)) / 1000),
+            pool_size
+        )
+
+    def get(self, url, priority=None, **kwargs):
+        """
+        GET a URL through the pooled session with the client timeouts.
+        Every attempt takes a token from the shared rate limiter at the given
+        priority (default: the caller's request_priority), then waits for one
+        of the client's pool_size request slots, so however deeply callers
+        nest their fan-outs each request gets a pooled connection. A 429
+        pauses all callers for its Retry-After and the call is retried. Each
+        attempt's latency, status and size are recorded in the metrics registry.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        endpoint = endpoint_name(url, BASE_URL)
+        for attempt in range(MAX_RETRIES + 1):
+            rate_limiter.acquire(priority)
+            start = time.perf_counter()
+            try:
+                with self._in_flight, span(f"GET {endpoint}", attempt=attempt):
+                    response = self.session.get(url, **kwargs)
+            except requests.RequestException:
+                metrics.record_call(endpoint, None, (time.perf_counter() - start) * 1000)
+                raise
+            # Streamed bodies aren't read yet, so they count by their declared length
+            size = (int(response.headers.get('Content-Length') or 0) if kwargs.get('stream')
+                    else len(response.content))
+            metrics.record_call(endpoint, response.status_code, (time.perf_counter() - start) * 1000, size)
+            if response.status_code != 429 or attempt == MAX_RETRIES:
+                return response
+            try:
+                retry_after = float(response.headers.get('Retry-After', ''))
+            except ValueError:
+                retry_after = 2 ** attempt
+            response.close()
+            rate_limiter.throttle(retry_after)
+        return response
+
+    def get_json(self, path, priority=None):
+        """GET a Sleeper API path and return the decoded JSON, or None on failure"""
+        return self.get_json_conditional(path, priority=priority).value
+
+    def get_json_conditional(self, path, validators=None, priority=None):
+        """
+        GET a Sleeper API path, revalidating a previously fetched copy when
+        validators (its 'etag' / 'last_modified') are given.
+        Returns a ConditionalResponse; not_modified is True on a 304.
+        """
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        try:
+            response = self.get(f"{BASE_URL}/{path}", priority=priority, headers=headers)
+        except requests.RequestException:
+            return ConditionalResponse(None, {}, False)
+
+        if response.status_code == 304:
+            return ConditionalResponse(None, validators, True)
+        if response.status_code != 200:
+            return ConditionalResponse(None, {}, False)
+        new_validators = {
+            key: response.headers[header]
+            for key, header in (('etag', 'ETag'), ('last_modified', 'Last-Modified'))
+            if response.headers.get(header)
+        }
+        return ConditionalResponse(response.json(), new_validators, False)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide SleeperClient, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SleeperClient()
+    return _client
+
+
+def configure_client(pool_size=POOL_SIZE, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                     transport=None, fixture=None, replay_latency=None):
+    """Replace the shared client, e.g. to change the pool size, timeouts or transport"""
+    global _client
+    with _client_lock:
+        old_client = _client
+        _client = SleeperClient(pool_size, connect_timeout, read_timeout, transport, fixture, replay_latency)
+    if old_client is not None:
+        old_client.close()
+    return _client
+
 
 def get_user_id(username):
-    """Get user ID from username"""
-    response = requests.get(f"https://api.sleeper.app/v1/user/{username}")
-    if response.status_code == 200:
-        user_data = response.json()
-        if user_data and 'user_id' in user_data:  # Check if user_data exists and has user_id
-            return user_data['user_id']
+    """
+    Get user ID from username, or None if Sleeper has no such user.
+    Raises requests.RequestException when Sleeper can't be reached or doesn't
+    answer with a 200, so a failed lookup is never taken for a missing user.
+    """
+    response = get_client().get(f"{BASE_URL}/user/{username}", priority=INTERACTIVE)
+    if response.status_code != 200:
+        raise requests.HTTPError(f"user/{username} returned {response.status_code}", response=response)
+    user_data = response.json()
+    if user_data and 'user_id' in user_data:  # Sleeper answers an unknown username with null
+        return user_data['user_id']
     return None
 
 def get_user_leagues(user_id, season=None):
@@ -18,70 +169,63 @@ def get_user_leagues(user_id, season=None):
     """
     if not user_id:  # Add check for user_id
         return None
-        
+
     if season:
-        response = requests.get(f"https://api.sleeper.app/v1/user/{user_id}/leagues/nfl/{season}")
+        leagues = get_client().get_json(f"user/{user_id}/leagues/nfl/{season}", priority=INTERACTIVE)
     else:
-        response = requests.get(f"https://api.sleeper.app/v1/user/{user_id}/leagues/nfl")
-    
-    if response.status_code == 200:
-        leagues = response.json()
-        return leagues if leagues else None
-    return None
+        leagues = get_client().get_json(f"user/{user_id}/leagues/nfl", priority=INTERACTIVE)
+
+    return leagues if leagues else None
+
+def get_nfl_state():
+    """Get the current NFL state: season, league_season, week and season_type"""
+    return get_client().get_json("state/nfl")
 
 def get_league_data(league_id):
     """Get detailed information about a specific league"""
-    response = requests.get(f"https://api.sleeper.app/v1/league/{league_id}")
-    return response.json() if response.status_code == 200 else None
+    return get_client().get_json(f"league/{league_id}")
 
 def get_users(league_id):
-    response = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/users")
-    return response.json() if response.status_code == 200 else None
+    return get_client().get_json(f"league/{league_id}/users")
 
 def get_rosters(league_id):
-    response = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/rosters")
-    return response.json() if response.status_code == 200 else None
+    return get_client().get_json(f"league/{league_id}/rosters")
 
 def get_players():
-    response = requests.get("https://api.sleeper.app/v1/players/nfl")
-    return response.json() if response.status_code == 200 else None
+    return get_client().get_json("players/nfl")
 
 def get_player_stats(season_type, season, week):
-    response = requests.get(f"https://api.sleeper.app/v1/stats/nfl/{season}/{season_type}/{week}")
-    return response.json() if response.status_code == 200 else None
+    return get_client().get_json(f"stats/nfl/{season}/{season_type}/{week}")
 
 def get_weekly_matchups(league_id, week):
-    response = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/matchups/{week}")
-    return response.json() if response.status_code == 200 else None
+    return get_client().get_json(f"league/{league_id}/matchups/{week}")
 
 def get_playoff_bracket(league_id):
     """Get playoff bracket information for a league"""
-    response = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/winners_bracket")
-    return response.json() if response.status_code == 200 else None
+    return get_client().get_json(f"league/{league_id}/winners_bracket")
 
 def get_league_winner(league_id):
     """Get the winner of a league by checking league metadata"""
     # Get league data
     league_data = get_league_data(league_id)
-    
+
     if league_data and 'metadata' in league_data:
         # Check if there's a winner roster ID in metadata
         winner_roster_id = league_data['metadata'].get('latest_league_winner_roster_id')
-        
+
         if winner_roster_id:
             # Get rosters to match the winner roster ID to owner
             rosters = get_rosters(league_id)
             if rosters:
                 winner_roster = next(
-                    (r for r in rosters if str(r['roster_id']) == str(winner_roster_id)), 
+                    (r for r in rosters if str(r['roster_id']) == str(winner_roster_id)),
                     None
                 )
                 if winner_roster:
                     return winner_roster.get('owner_id')
-    
+
     return None
 
 def get_matchups_for_week(league_id, week):
     """Get matchup data for a specific week"""
-    response = requests.get(f"https://api.sleeper.app/v1/league/{league_id}/matchups/{week}")
-    return response.json() if response.status_code == 200 else None
\ No newline at end of file
+    return get_client().get_json(f"league/{league_id}/matchups/{week}")
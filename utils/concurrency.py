@@ -0,0 +1,89 @@
+# utils/concurrency.py
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from utils.metrics import metrics
+
+MAX_WORKERS = 8  # Threads per fan-out; the Sleeper client caps in-flight requests process-wide
+
+
+def _attach_script_ctx(ctx):
+    """Give worker threads the calling script's context so st.* calls work"""
+    if ctx is not None:
+        add_script_run_ctx(threading.current_thread(), ctx)
+
+
+def make_executor(max_workers: Optional[int] = None) -> ThreadPoolExecutor:
+    """Bounded thread pool whose workers carry the calling script's context"""
+    return ThreadPoolExecutor(
+        max_workers=max_workers or MAX_WORKERS,
+        initializer=_attach_script_ctx,
+        initargs=(get_script_run_ctx(suppress_warning=True),)
+    )
+
+
+def submit(executor: ThreadPoolExecutor, fn: Callable, *args):
+    """Submit a task that runs in a copy of the caller's context (e.g. its request priority)"""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+def run_parallel(tasks: Sequence[Callable[[], Any]], max_workers: Optional[int] = None) -> List[Any]:
+    """
+    Run independent zero-argument callables concurrently on a bounded pool.
+    Results come back in the same order as the tasks, regardless of which
+    call finishes first. Exceptions raised by a task propagate to the caller.
+    """
+    tasks = list(tasks)
+    if not tasks:
+        return []
+    if len(tasks) == 1:
+        return [tasks[0]()]
+
+    with make_executor(min(max_workers or MAX_WORKERS, len(tasks))) as executor:
+        futures = [submit(executor, task) for task in tasks]
+        return [future.result() for future in futures]
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key: the first caller runs the
+    function, everyone who arrives while it is in flight waits and gets the
+    same result (or exception). Nothing is kept once the call finishes, so
+    this deduplicates simultaneous work across sessions, not repeated work.
+    With a name, shared calls count as hits under that name in the metrics.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.coalesced = 0  # Calls that shared another caller's result
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if self.name:
+            metrics.record_cache(self.name, hit=not leader)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -1,232 +1,529 @@
 # utils/data_cache.py
 import streamlit as st
-from typing import Dict, List, Optional
-from functools import lru_cache
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+from functools import lru_cache, partial, wraps
+import numpy as np
 import pandas as pd
 from utils.api import (
-    get_user_id,
-    get_user_leagues,
-    get_league_data,
-    get_users,
-    get_rosters,
-    get_matchups_for_week,
-    get_playoff_bracket
+    get_client,
+    get_user_leagues
 )
+from utils.concurrency import SingleFlight, make_executor, run_parallel, submit
+from utils.rate_limit import INTERACTIVE
+from utils.standings import create_rosters_df, compute_standings, get_owner_performance
+from utils.response_store import response_store, LIVE_TTL, NEVER_EXPIRES
+from utils.identity import identity_index
+from utils.metrics import metrics
+from utils.nfl_calendar import nfl_calendar
+from utils.tracing import span, traced
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+EARLIEST_SEASON = 2015  # Lower bound when probing for a user's seasons
+
+MEMORY_TTL = 3600  # In-memory copies; live data is kept current by refresh_live_week
+
+# Sleeper API path behind each stored endpoint
+ENDPOINT_PATHS = {
+    'league': "league/{0}",
+    'users': "league/{0}/users",
+    'rosters': "league/{0}/rosters",
+    'winners_bracket': "league/{0}/winners_bracket",
+    'matchups': "league/{0}/matchups/{1}",
+    'user_leagues': "user/{0}/leagues/nfl/{1}"
+}
+
+# Endpoints a user is actively waiting on; everything else uses the caller's priority
+ENDPOINT_PRIORITIES = {
+    'user_leagues': INTERACTIVE
+}
+
+# Raw endpoint behind each part of the cached league info bundle
+LEAGUE_ENDPOINTS = {
+    'league_data': 'league',
+    'users': 'users',
+    'rosters': 'rosters',
+    'playoff_bracket': 'winners_bracket'
+}
+
+# Sessions asking for the same upstream data at the same moment share one fetch
+single_flight = SingleFlight('single_flight')
+
+def _tracked_cache(name, **cache_kwargs):
+    """st.cache_data that also counts its hits and misses in the metrics registry"""
+    def decorate(func):
+        @wraps(func)
+        def load(*args, **kwargs):
+            metrics.cache_miss(name)  # Only runs when the cache has no entry
+            with span(name):
+                return func(*args, **kwargs)
+        cached = st.cache_data(**cache_kwargs)(load)
+
+        @wraps(func)
+        def lookup(*args, **kwargs):
+            metrics.record_cache(name, hit=True)
+            return cached(*args, **kwargs)
+        lookup.clear = cached.clear
+        return lookup
+    return decorate
+
+def _league_ttl(league_data):
+    """Completed leagues can no longer change, so their data never expires"""
+    if isinstance(league_data, dict) and league_data.get('status') == 'complete':
+        return NEVER_EXPIRES
+    return LIVE_TTL
+
+def _matchups_ttl(league_data, week):
+    """
+    Matchups are final once the league is complete, or once the week is two
+    behind the current one: the week just played can still get stat corrections
+    """
+    if _league_ttl(league_data) is NEVER_EXPIRES:
+        return NEVER_EXPIRES
+    # 'leg' is the league's current week
+    current_week = ((league_data or {}).get('settings') or {}).get('leg')
+    if current_week and week < current_week - 1:
+        return NEVER_EXPIRES
+    return LIVE_TTL
+
+def _user_leagues_ttl(leagues, season):
+    """
+    A season's league list is fixed once every league in it is complete, or
+    when it is empty and the season is over: no leagues can be added to it
+    """
+    if leagues and all(league.get('status') == 'complete' for league in leagues):
+        return NEVER_EXPIRES
+    if not leagues and int(season) < min(_current_seasons()):
+        return NEVER_EXPIRES
+    return LIVE_TTL
+
+def _fetch(endpoint, params, entry):
+    """Fetch a raw response, revalidating an expired stored copy with a conditional request"""
+    return get_client().get_json_conditional(
+        ENDPOINT_PATHS[endpoint].format(*params),
+        entry.validators if entry else None,
+        priority=ENDPOINT_PRIORITIES.get(endpoint)
+    )
+
+def _save(endpoint, params, entry, result, ttl) -> bool:
+    """Merge a fetch result into the store; True if the stored data changed"""
+    if result.not_modified:
+        response_store.touch(endpoint, *params, ttl=ttl)
+        return False
+    if result.value is None:
+        return False  # Failed fetch: keep serving any stale copy
+    response_store.put(endpoint, *params, value=result.value, ttl=ttl, validators=result.validators)
+    return entry is None or entry.value != result.value
+
+def _value(entry, result):
+    """The freshest value available after a fetch, falling back to the stored copy"""
+    if result.value is None and entry is not None:
+        return entry.value
+    return result.value
+
+def _revalidate(endpoint, params, ttl_for) -> Tuple[object, bool]:
+    """Fetch and store a response unless it became fresh meanwhile; (value, changed)"""
+    entry = response_store.get_entry(endpoint, *params)
+    if entry is not None and not entry.expired:
+        return entry.value, False
+    result = _fetch(endpoint, params, entry)
+    value = _value(entry, result)
+    return value, _save(endpoint, params, entry, result, ttl_for(value))
+
+def _stored(endpoint, params, ttl_for):
+    """Serve a raw response from the persistent store, fetching it on a miss or expiry"""
+    entry = response_store.get_entry(endpoint, *params)
+    fresh = entry is not None and not entry.expired
+    metrics.record_cache(f"store/{endpoint}", hit=fresh)
+    if fresh:
+        return entry.value
+    value, _ = single_flight.do(
+        ('stored', endpoint, *params),
+        partial(_revalidate, endpoint, params, ttl_for)
+    )
+    return value
+
+def _refresh_league_once(league_id: str, endpoints: Tuple[str, ...]) -> bool:
+    entries = {endpoint: response_store.get_entry(endpoint, league_id) for endpoint in endpoints}
+    stale = [endpoint for endpoint, entry in entries.items() if entry is None or entry.expired]
+    for endpoint in endpoints:
+        metrics.record_cache(f"store/{endpoint}", hit=endpoint not in stale)
+    results = dict(zip(stale, run_parallel([
+        partial(_fetch, endpoint, (league_id,), entries[endpoint]) for endpoint in stale
+    ])))
+    
+    league_entry = entries.get('league') or response_store.get_entry('league', league_id)
+    if 'league' in results:
+        league_data = _value(league_entry, results['league'])
+    else:
+        league_data = league_entry.value if league_entry else None
+    ttl = _league_ttl(league_data)
+    changed = [_save(endpoint, (league_id,), entries[endpoint], results[endpoint], ttl) for endpoint in stale]
+    return any(changed)
+
+@traced()
+def _refresh_league(league_id: str, endpoints: List[str]) -> bool:
+    """
+    Revalidate a league's stored endpoints side by side and merge the results.
+    Only missing or expired entries are fetched. True if anything changed.
+    Concurrent refreshes of the same league and endpoints share one round of fetches.
+    """
+    endpoints = tuple(endpoints)
+    return single_flight.do(
+        ('league', league_id, endpoints),
+        partial(_refresh_league_once, league_id, endpoints)
+    )
+
+@_tracked_cache('memory/league_info', ttl=MEMORY_TTL)  # Completed seasons are served from the persistent store
 def get_cached_league_info(league_id: str):
     """Cache league info to minimize API calls"""
-    league_data = get_league_data(league_id)
-    users = get_users(league_id)
-    rosters = get_rosters(league_id)
-    playoff_bracket = get_playoff_bracket(league_id)
-    
-    return {
-        'league_data': league_data,
-        'users': users,
-        'rosters': rosters,
-        'playoff_bracket': playoff_bracket
-    }
+    # The endpoints are independent, so any missing ones are fetched side by side
+    _refresh_league(league_id, list(LEAGUE_ENDPOINTS.values()))
+    entries = {name: response_store.get_entry(endpoint, league_id) for name, endpoint in LEAGUE_ENDPOINTS.items()}
+    return {name: entry.value if entry else None for name, entry in entries.items()}
 
-@st.cache_data(ttl=3600)
+@_tracked_cache('memory/matchups', ttl=MEMORY_TTL)
 def get_cached_matchups(league_id: str, week: int):
     """Cache matchup data to minimize API calls"""
-    return get_matchups_for_week(league_id, week)
+    league_data = _stored('league', (league_id,), _league_ttl)
+    return _stored('matchups', (league_id, week), lambda matchups: _matchups_ttl(league_data, week))
 
-@st.cache_data(ttl=3600)
+@_tracked_cache('memory/user_leagues', ttl=MEMORY_TTL)
 def get_cached_user_leagues(user_id: str, season: Optional[str] = None):
     """Cache user leagues to minimize API calls"""
-    return get_user_leagues(user_id, season)
+    if not user_id:
+        return None
+    if season is None:
+        return get_user_leagues(user_id)
+    leagues = _stored('user_leagues', (user_id, season), lambda leagues: _user_leagues_ttl(leagues, season))
+    return leagues if leagues else None
+
+@traced()
+def refresh_live_week(league_ids) -> bool:
+    """
+    Incremental in-season refresh. For every league that is still live,
+    revalidate the league object, rosters and bracket plus the matchups of
+    the in-progress weeks (the current NFL week and the one before, which
+    can still get stat corrections) once their stored copies expire, using
+    conditional requests. Changed data is merged into the store and only the
+    affected in-memory cache entries are dropped. Returns True if anything
+    changed, so the caller can rebuild what it derived from the old data.
+    """
+    live_leagues = [
+        league_id for league_id in league_ids
+        if (entry := response_store.get_entry('league', league_id)) is not None
+        and _league_ttl(entry.value) is not NEVER_EXPIRES
+    ]
+    if not live_leagues:
+        return False
+    # From memory: a slow state endpoint must not hold up the rerun
+    current_week = nfl_calendar.current().week
+    
+    def refresh(league_id):
+        league_changed = _refresh_league(league_id, ['league', 'rosters', 'winners_bracket'])
+        league_data = response_store.get('league', league_id)
+        weeks = [week for week in (current_week - 1, current_week) if week >= 1]
+        
+        weeks_changed = []
+        for week in weeks:
+            entry = response_store.get_entry('matchups', league_id, week)
+            if entry is not None and not entry.expired:
+                continue
+            _, week_changed = single_flight.do(
+                ('stored', 'matchups', league_id, week),
+                partial(_revalidate, 'matchups', (league_id, week),
+                        lambda matchups, week=week: _matchups_ttl(league_data, week))
+            )
+            if week_changed:
+                weeks_changed.append(week)
+        
+        if league_changed:
+            get_cached_league_info.clear(league_id)
+        for week in weeks_changed:
+            get_cached_matchups.clear(league_id, week)
+        if league_changed or weeks_changed:
+            get_cached_league_matchups.clear(league_id)
+            return True
+        return False
+    
+    changed = any(run_parallel([partial(refresh, league_id) for league_id in live_leagues]))
+    if changed:
+        # Views derived from many leagues are rebuilt from the in-memory caches
+        get_cached_league_standings.clear()
+        get_cached_head_to_head_history.clear()
+    return changed
+
+def _current_seasons() -> List[int]:
+    """
+    The season in progress and, in the offseason, the upcoming league season.
+    From the calendar's memory, so an expired or slow NFL state never blocks a rerun.
+    """
+    current = nfl_calendar.current()
+    return sorted({int(current.season), int(current.league_season)})
+
+def iter_user_seasons(user_id: str) -> Iterator[Tuple[int, list]]:
+    """
+    Discover the seasons a user has leagues in, yielding (season, leagues)
+    as each lineage step returns, newest seasons first.
+    Starts from the current season(s) in the NFL state and walks back one
+    season for every league with a previous_league_id, filling any gaps
+    between the earliest and latest seasons found. Once that runs out, every
+    season left down to EARLIEST_SEASON is probed in one batch, since a
+    league started fresh (no previous_league_id) hides the older ones; empty
+    past seasons are stored for good, so the probe costs nothing next time.
+    """
+    season_leagues = {}
+    frontier = set(_current_seasons())
+    probed_all = False
+    
+    while frontier:
+        seasons = sorted(frontier, reverse=True)
+        results = run_parallel([
+            partial(get_cached_user_leagues, user_id, str(season)) for season in seasons
+        ])
+        season_leagues.update(zip(seasons, results))
+        for season, leagues in zip(seasons, results):
+            if leagues:
+                yield season, leagues
+        
+        # Follow each league's lineage back to the previous season
+        frontier = {
+            season - 1
+            for season, leagues in zip(seasons, results) if leagues
+            for league in leagues
+            if league.get('previous_league_id') not in (None, '0')
+        }
+        
+        found = [season for season, leagues in season_leagues.items() if leagues]
+        if found:
+            frontier.update(range(min(found), max(found) + 1))
+        frontier = {
+            season for season in frontier
+            if season not in season_leagues and season >= EARLIEST_SEASON
+        }
+        if not frontier and not probed_all:
+            probed_all = True
+            frontier = set(range(EARLIEST_SEASON, max(season_leagues))) - set(season_leagues)
+
+@_tracked_cache('memory/user_seasons', ttl=LIVE_TTL)
+def get_cached_user_seasons(user_id: str) -> Dict[int, list]:
+    """Every season a user has leagues in, mapped to those leagues (see iter_user_seasons)"""
+    return dict(sorted(iter_user_seasons(user_id)))
 
+MATCHUP_COLUMNS = ['week', 'roster_id', 'matchup_id', 'points']
+
+def get_league_weeks(league_info) -> int:
+    """Last week with matchups in a league: the regular season plus every playoff round"""
+    league_data = league_info.get('league_data') or {}
+    playoff_week_start = (league_data.get('settings') or {}).get('playoff_week_start', 14)
+    playoff_rounds = max(
+        (match.get('r', 0) for match in league_info.get('playoff_bracket') or []),
+        default=0
+    )
+    return playoff_week_start + playoff_rounds - 1
+
+@_tracked_cache('memory/league_matchups', ttl=MEMORY_TTL)
+def get_cached_league_matchups(league_id: str) -> pd.DataFrame:
+    """
+    Load every week of a league's matchups at once as a compact
+    (week, roster_id, matchup_id, points) table indexed by roster_id.
+    """
+    league_info = get_cached_league_info(league_id)
+    weeks = range(1, get_league_weeks(league_info) + 1)
+    weekly_matchups = run_parallel([partial(get_cached_matchups, league_id, week) for week in weeks])
+    
+    rows = [
+        (week, matchup['roster_id'], matchup.get('matchup_id'), float(matchup.get('points') or 0))
+        for week, matchups in zip(weeks, weekly_matchups) if matchups
+        for matchup in matchups
+    ]
+    return pd.DataFrame(rows, columns=MATCHUP_COLUMNS).set_index('roster_id').sort_index()
+
+def get_roster_weeks(matchup_table: pd.DataFrame, roster_id) -> pd.DataFrame:
+    """One roster's (matchup_id, points) per week, looked up via the roster_id index"""
+    if roster_id not in matchup_table.index:
+        return pd.DataFrame(columns=['matchup_id', 'points'], index=pd.Index([], name='week'))
+    return matchup_table.loc[[roster_id]].set_index('week')
+
+@_tracked_cache('memory/league_standings', ttl=MEMORY_TTL)
+def get_cached_league_standings(league_ids: tuple) -> pd.DataFrame:
+    """
+    Standings and performance rows for every owner in the given leagues,
+    built from the cached league info. Any manager's career rows are then
+    a filter on this frame rather than a new crawl.
+    """
+    league_ids = list(league_ids)
+    league_infos = run_parallel([partial(get_cached_league_info, league_id) for league_id in league_ids])
+    return compute_standings(create_rosters_df(
+        (int(league_info['league_data']['season']), league_info['league_data']['name'], league_id, league_info)
+        for league_id, league_info in zip(league_ids, league_infos)
+        if league_info and league_info.get('league_data')
+    ))
+
+@traced()
+def get_manager_mapping(league_ids) -> Dict[str, str]:
+    """Get mapping of user_ids to their most recent display names, from the identity index"""
+    league_ids = list(league_ids)
+    
+    # Only leagues the index hasn't seen, or that are still live, need their users loaded
+    unindexed = identity_index.unindexed(league_ids)
+    league_infos = run_parallel([partial(get_cached_league_info, league_id) for league_id in unindexed])
+    identity_index.index_leagues(zip(unindexed, league_infos))
+    
+    return identity_index.latest_display_names(league_ids)
+
+@traced()
 def get_user_performance_optimized(username: str):
     """Optimized version of get_user_performance"""
-    user_id = get_user_id(username)
+    user_id = identity_index.resolve_username(username)
     if not user_id:
         return None
     
-    performance_data = []
-    cached_league_data = {}
-    
-    # Get all leagues first
-    for season in range(2015, 2025):
-        leagues = get_cached_user_leagues(user_id, str(season))
-        if not leagues:
-            continue
-            
-        # Batch fetch league data
-        for league in leagues:
-            league_id = league['league_id']
-            cached_league_data[league_id] = get_cached_league_info(league_id)
-    
-    # Process the cached data
-    for season in range(2015, 2025):
-        leagues = get_cached_user_leagues(user_id, str(season))
-        if leagues:
+    # Get all leagues first, only for seasons the user actually played
+    league_ids = tuple(
+        league['league_id']
+        for leagues in get_cached_user_seasons(user_id).values()
+        for league in leagues
+    )
+    
+    # Rank every roster of every league in one pass, then keep the user's rows
+    return get_owner_performance(get_cached_league_standings(league_ids), user_id)
+
+def iter_user_performance(username: str) -> Iterator[pd.DataFrame]:
+    """
+    Streaming version of get_user_performance_optimized. Yields the user's
+    performance rows one league at a time as soon as each league's info
+    arrives, while season discovery keeps walking back in the meantime.
+    Rows come in completion order; sort by Season for display.
+    """
+    user_id = identity_index.resolve_username(username)
+    if not user_id:
+        return
+    
+    def league_rows(future):
+        season, league = pending.pop(future)
+        league_info = future.result()
+        return get_owner_performance(
+            compute_standings(create_rosters_df([(season, league['name'], league['league_id'], league_info)])),
+            user_id
+        )
+    
+    with make_executor() as executor:
+        pending = {}
+        for season, leagues in iter_user_seasons(user_id):
             for league in leagues:
-                try:
-                    league_id = league['league_id']
-                    league_info = cached_league_data.get(league_id)
-                    
-                    if not league_info:
-                        continue
-                        
-                    rosters = league_info['rosters']
-                    league_data = league_info['league_data']
-                    
-                    user_roster = next((r for r in rosters if r['owner_id'] == user_id), None)
-                    if user_roster:
-                        wins = user_roster['settings'].get('wins', 0)
-                        losses = user_roster['settings'].get('losses', 0)
-                        
-                        # Sort rosters by wins to get standing
-                        sorted_rosters = sorted(rosters, 
-                                             key=lambda x: (x['settings'].get('wins', 0), 
-                                                          x['settings'].get('fpts', 0)), 
-                                             reverse=True)
-                        standing = next((i + 1 for i, r in enumerate(sorted_rosters) 
-                                      if r['roster_id'] == user_roster['roster_id']), None)
-                        
-                        total_teams = len(rosters)
-                        
-                        # Check if user is champion
-                        is_champion = False
-                        if (league_data and 
-                            isinstance(league_data, dict) and 
-                            league_data.get('status') == 'complete' and 
-                            isinstance(league_data.get('metadata'), dict)):
-                            winner_roster_id = league_data.get('metadata', {}).get('latest_league_winner_roster_id')
-                            if winner_roster_id:
-                                is_champion = str(user_roster['roster_id']) == str(winner_roster_id)
-                        
-                        # Calculate achievements - exactly matching the expected column names
-                        performance_data.append({
-                            'Season': season,
-                            'League': league['name'],
-                            'Games Above 500': wins - losses,
-                            'Standing': standing,
-                            'Total Teams': total_teams,
-                            'Is Regular Season Winner': standing == 1,
-                            'Is Champion': is_champion,  # Now matches exactly
-                            'In Top 6': standing <= 6 if total_teams >= 8 else standing <= (total_teams * 0.75),
-                            'In Bottom 4': standing > (total_teams - 4) if total_teams >= 8 else standing > (total_teams * 0.5),
-                            'league_id': league_id
-                        })
-                except Exception as e:
-                    st.warning(f"Error processing league for season {season}: {str(e)}")
-                    continue
-    
-    # Create DataFrame and ensure all boolean columns are properly typed
-    df = pd.DataFrame(performance_data)
-    boolean_columns = ['Is Champion', 'Is Regular Season Winner', 'In Top 6', 'In Bottom 4']
-    for col in boolean_columns:
-        df[col] = df[col].astype(bool)
-    
-    return df
+                pending[submit(executor, get_cached_league_info, league['league_id'])] = (season, league)
+            # Hand over whatever finished while discovery was running
+            for future in [future for future in pending if future.done()]:
+                yield league_rows(future)
+        
+        while pending:
+            finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield league_rows(future)
 
+PLAYOFF_ROUND_NAMES = {
+    1: "First Round",
+    2: "Semi-Finals",
+    3: "Finals"
+}
+
+H2H_COLUMNS = ['Season', 'Week', 'League', 'User Score', 'Opponent Score', 'Result', 'Type',
+               'week', 'opponent_id', 'league_id']
+
+def _league_head_to_head(league_id: str, league_info, matchup_table: pd.DataFrame, user_id: str) -> pd.DataFrame:
+    """Every game between the user and any opponent in one league"""
+    league_data = league_info['league_data']
+    rosters = league_info['rosters']
+    roster_to_user = {
+        roster['roster_id']: roster['owner_id']
+        for roster in rosters
+        if roster.get('owner_id')
+    }
+    user_roster_id = next((rid for rid, uid in roster_to_user.items() if uid == user_id), None)
+    if not user_roster_id:
+        return pd.DataFrame(columns=H2H_COLUMNS)
+    
+    reg_season_weeks = league_data.get('settings', {}).get('playoff_week_start', 14)
+    
+    # Pair the user's row with every other roster's row in the same week
+    opponents = matchup_table.reset_index()
+    games = get_roster_weeks(matchup_table, user_roster_id).reset_index().merge(
+        opponents[opponents['roster_id'] != user_roster_id],
+        on='week', suffixes=('_user', '_opp')
+    )
+    
+    # Regular season: same week and same matchup_id
+    regular_season = games[
+        (games['week'] < reg_season_weeks) &
+        games['matchup_id_user'].notna() &
+        (games['matchup_id_user'] == games['matchup_id_opp'])
+    ].assign(Type='Regular Season')
+    regular_season['Week'] = regular_season['week']
+    
+    # Playoffs: the opponent the bracket paired the user with in each round. A slot not
+    # filled yet (a bye, or a game still to be decided) holds None or a {'w': m} reference
+    user_matches = [
+        (match['r'], match.get('t2') if match.get('t1') == user_roster_id else match.get('t1'))
+        for match in league_info['playoff_bracket'] or []
+        if user_roster_id in (match.get('t1'), match.get('t2')) and match.get('r')
+    ]
+    bracket_games = pd.DataFrame([
+        {
+            'week': reg_season_weeks + round_number - 1,
+            'roster_id': opponent,
+            'Week': PLAYOFF_ROUND_NAMES.get(round_number, f"Round {round_number}")
+        }
+        for round_number, opponent in user_matches
+        if isinstance(opponent, int)
+    ], columns=['week', 'roster_id', 'Week']).astype({'week': 'int64', 'roster_id': 'int64'})
+    playoffs = games.merge(bracket_games, on=['week', 'roster_id']).assign(Type='Playoffs')
+    
+    league_games = pd.concat([regular_season, playoffs], ignore_index=True)
+    # A game counts once both teams have scored; a zero on either side is a week not played yet.
+    # Every head-to-head view reads this history, so this is the one place the rule lives.
+    league_games = league_games[(league_games['points_user'] != 0) & (league_games['points_opp'] != 0)]
+    
+    user_score = league_games['points_user'].round(2)
+    opp_score = league_games['points_opp'].round(2)
+    return pd.DataFrame({
+        'Season': int(league_data['season']),
+        'Week': league_games['Week'],
+        'League': league_data['name'],
+        'User Score': user_score,
+        'Opponent Score': opp_score,
+        'Result': np.select([user_score > opp_score, user_score < opp_score], ['Win', 'Loss'], 'Tie'),
+        'Type': league_games['Type'],
+        'week': league_games['week'],
+        'opponent_id': league_games['roster_id'].map(roster_to_user),
+        'league_id': league_id
+    }, columns=H2H_COLUMNS).dropna(subset=['opponent_id'])
+
+@_tracked_cache('memory/head_to_head_history', ttl=MEMORY_TTL)
+def get_cached_head_to_head_history(league_ids: tuple, user_id: str) -> pd.DataFrame:
+    """
+    Build the user's game history against every opponent in one pass over
+    the leagues. Selecting a different opponent is then just a filter.
+    """
+    league_ids = list(league_ids)
+    league_infos = run_parallel([partial(get_cached_league_info, league_id) for league_id in league_ids])
+    matchup_tables = run_parallel([partial(get_cached_league_matchups, league_id) for league_id in league_ids])
+    
+    league_histories = [
+        _league_head_to_head(league_id, league_info, matchup_table, user_id)
+        for league_id, league_info, matchup_table in zip(league_ids, league_infos, matchup_tables)
+        if league_info and league_info['league_data'] and league_info['rosters']
+    ]
+    league_histories = [history for history in league_histories if not history.empty]
+    if not league_histories:
+        return pd.DataFrame(columns=H2H_COLUMNS)
+    return pd.concat(league_histories, ignore_index=True)
+
+@traced()
 def analyze_head_to_head_optimized(league_ids: List[str], user_id: str, opponent_id: str):
     """Optimized version of analyze_head_to_head including playoff matchups"""
-    matchup_history = []
-    
-    for league_id in league_ids:
-        league_info = get_cached_league_info(league_id)
-        if not league_info:
-            continue
-            
-        league_data = league_info['league_data']
-        rosters = league_info['rosters']
-        playoff_bracket = league_info['playoff_bracket']
-        
-        if not league_data or not rosters:
-            continue
-        
-        # Create user ID to roster ID mapping
-        user_to_roster = {
-            roster['owner_id']: roster['roster_id']
-            for roster in rosters
-            if roster.get('owner_id')
-        }
-        
-        user_roster_id = user_to_roster.get(user_id)
-        opponent_roster_id = user_to_roster.get(opponent_id)
-        
-        if not user_roster_id or not opponent_roster_id:
-            continue
-            
-        season = league_data['season']
-        reg_season_weeks = league_data.get('settings', {}).get('playoff_week_start', 14)
-        
-        # Regular Season Matchups
-        for week in range(1, reg_season_weeks):
-            matchups = get_cached_matchups(league_id, week)
-            if not matchups:
-                continue
-            
-            user_matchup = next((m for m in matchups if m['roster_id'] == user_roster_id), None)
-            opponent_matchup = next((m for m in matchups if m['roster_id'] == opponent_roster_id), None)
-            
-            if (user_matchup and opponent_matchup and 
-                user_matchup.get('matchup_id') == opponent_matchup.get('matchup_id')):
-                
-                user_score = float(user_matchup.get('points', 0))
-                opp_score = float(opponent_matchup.get('points', 0))
-                
-                if user_score == 0 and opp_score == 0:
-                    continue
-
-                matchup_history.append({
-                    'Season': int(season),
-                    'Week': week,
-                    'League': league_data['name'],
-                    'User Score': round(user_score, 2),
-                    'Opponent Score': round(opp_score, 2),
-                    'Result': 'Win' if user_score > opp_score else 'Loss' if user_score < opp_score else 'Tie',
-                    'Type': 'Regular Season'
-                })
-        
-        # Playoff Matchups
-        if playoff_bracket:
-            # Find direct matchups in the playoff bracket
-            playoff_matchup = next(
-                (match for match in playoff_bracket 
-                 if (match.get('t1') == user_roster_id and match.get('t2') == opponent_roster_id) or
-                    (match.get('t1') == opponent_roster_id and match.get('t2') == user_roster_id)),
-                None
-            )
-            
-            if playoff_matchup:
-                round_num = playoff_matchup.get('r')
-                week = reg_season_weeks + round_num - 1
-                
-                round_names = {
-                    1: "First Round",
-                    2: "Semi-Finals",
-                    3: "Finals"
-                }
-                playoff_round = round_names.get(round_num, f"Round {round_num}")
-                
-                matchups = get_cached_matchups(league_id, week)
-                if matchups:
-                    user_matchup = next((m for m in matchups if m['roster_id'] == user_roster_id), None)
-                    opponent_matchup = next((m for m in matchups if m['roster_id'] == opponent_roster_id), None)
-                    
-                    if user_matchup and opponent_matchup:
-                        user_score = float(user_matchup.get('points', 0))
-                        opp_score = float(opponent_matchup.get('points', 0))
-                        
-                        if user_score == 0 and opp_score == 0:
-                            continue
-                        
-                        matchup_history.append({
-                            'Season': int(season),
-                            'Week': playoff_round,
-                            'League': league_data['name'],
-                            'User Score': round(user_score, 2),
-                            'Opponent Score': round(opp_score, 2),
-                            'Result': 'Win' if user_score > opp_score else 'Loss' if user_score < opp_score else 'Tie',
-                            'Type': 'Playoffs'
-                        })
-    
-    df = pd.DataFrame(matchup_history)
-    if not df.empty:
-        df = df.sort_values(['Season', 'Week'], ascending=[False, True])
-    return df
\ No newline at end of file
+    history = get_cached_head_to_head_history(tuple(league_ids), user_id)
+    df = history[history['opponent_id'] == opponent_id].drop(columns=['opponent_id', 'league_id'])
+    if df.empty:
+        return pd.DataFrame()
+    # 'week' keeps playoff rounds, which are labelled by name, in calendar order
+    return df.sort_values(['Season', 'week'], ascending=[False, True])
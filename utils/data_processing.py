@@ -1,33 +1,23 @@
+from functools import partial
 import pandas as pd
-from .api import get_rosters, get_league_winner
+from .concurrency import run_parallel
+from .data_cache import get_cached_league_info
+from .standings import create_rosters_df, compute_standings
 
 def process_league_data(user_id, leagues_data):
     """Process league data to include championship information"""
-    league_results = []
+    league_infos = run_parallel([
+        partial(get_cached_league_info, league['league_id']) for league in leagues_data
+    ])
+    standings = compute_standings(create_rosters_df(
+        (league['season'], league['name'], league['league_id'], league_info)
+        for league, league_info in zip(leagues_data, league_infos)
+    ))
     
-    for league in leagues_data:
-        league_id = league['league_id']
-        user_roster = None
-        rosters = get_rosters(league_id)
-        
-        if rosters:
-            user_roster = next((r for r in rosters if r['owner_id'] == user_id), None)
-        
-        if user_roster:
-            winner_id = get_league_winner(league_id)
-            is_champion = winner_id == user_id if winner_id else False
-            
-            league_results.append({
-                'Season': league['season'],
-                'League': league['name'],
-                'Total Teams': len(rosters),
-                'Standing': user_roster['settings']['rank'],
-                'Points': user_roster['settings'].get('fpts', 0),
-                'Is Champion': is_champion,
-                # ... other fields ...
-            })
-    
-    return pd.DataFrame(league_results)
+    league_results = standings[standings['owner_id'] == user_id].rename(columns={'fpts': 'Points'})
+    return league_results[
+        ['Season', 'League', 'Total Teams', 'Standing', 'Points', 'Is Champion']
+    ].reset_index(drop=True)
     
 def create_users_df(users, rosters):
     return pd.DataFrame([{
@@ -39,45 +29,97 @@ def create_users_df(users, rosters):
         'user_id': user['user_id']
     } for user in users])
 
+def create_player_points_df(weekly_matchups: dict) -> pd.DataFrame:
+    """Long-form (week, roster_id, player_id, pts_ppr) table, built once per league from players_points"""
+    rows = [
+        (week, matchup.get('roster_id'), player_id, points)
+        for week, matchups in weekly_matchups.items()
+        for matchup in matchups or []
+        for player_id, points in (matchup.get('players_points') or {}).items()
+    ]
+    return pd.DataFrame(rows, columns=['week', 'roster_id', 'player_id', 'pts_ppr'])
+
+def aggregate_roster_stats(player_points: pd.DataFrame, player_ids: list) -> pd.DataFrame:
+    """Season points and a per-week points series for every player in a roster, in one groupby"""
+    points = player_points[player_points['player_id'].isin(player_ids)]
+    totals = points.groupby('player_id')[['pts_ppr']].sum().reindex(player_ids, fill_value=0)
+    
+    # One entry per league week, zero for weeks the player scored nothing
+    weeks = sorted(player_points['week'].unique())
+    weekly = points.pivot_table(
+        index='player_id', columns='week', values='pts_ppr', aggfunc='sum', fill_value=0
+    ).reindex(index=player_ids, columns=weeks, fill_value=0)
+    totals['weekly_points'] = weekly.values.tolist()
+    return totals
+
 def create_roster_df(roster, players_data, weekly_stats):
     if not roster or not players_data:
         return pd.DataFrame()
-        
-    player_list = []
-    for player_id in roster['players']:
-        player = players_data.get(player_id, {})
-        season_stats = aggregate_player_stats(player_id, weekly_stats)
-        
-        player_list.append({
-            'Name': f"{player.get('first_name', '')} {player.get('last_name', '')}",
-            'Position': player.get('position', 'N/A'),
-            'Team': player.get('team', 'N/A'),
-            'Season Points': round(season_stats['pts_ppr'], 1),
-            'Total TDs': season_stats['td'],
-            'Pass Yards': season_stats['pass_yd'],
-            'Rush Yards': season_stats['rush_yd'],
-            'Rec Yards': season_stats['rec_yd'],
-            'player_id': player_id
-        })
-    return pd.DataFrame(player_list)
-
-def aggregate_player_stats(player_id: str, weekly_matchups: dict) -> dict:
-    total_stats = {
-        'pts_ppr': 0,
-        'td': 0,
-        'pass_yd': 0,
-        'rush_yd': 0,
-        'rec_yd': 0,
-        'weekly_points': []
-    }
     
-    for week, matchups in weekly_matchups.items():
-        for matchup in matchups:
-            if player_id in matchup.get('players_points', {}):
-                points = matchup['players_points'].get(player_id, 0)
-                total_stats['pts_ppr'] += points
-                total_stats['weekly_points'].append(points)
-            else:
-                total_stats['weekly_points'].append(0)
+    if not isinstance(weekly_stats, pd.DataFrame):
+        weekly_stats = create_player_points_df(weekly_stats)
+    
+    player_ids = list(roster.get('players') or [])
+    season_stats = aggregate_roster_stats(weekly_stats, player_ids)
+    players = [players_data.get(player_id, {}) for player_id in player_ids]
+    
+    # Matchups only carry fantasy points; box-score stats (TDs, yards) aren't fetched
+    return pd.DataFrame({
+        'Name': [
+            player.get('name') or f"{player.get('first_name', '')} {player.get('last_name', '')}"
+            for player in players
+        ],
+        'Position': [player.get('position', 'N/A') for player in players],
+        'Team': [player.get('team', 'N/A') for player in players],
+        'Season Points': season_stats['pts_ppr'].round(1).values,
+        'Weekly Points': season_stats['weekly_points'].values,
+        'player_id': player_ids
+    })
+
+def create_rivalries_df(h2h_history, manager_mapping):
+    """Summarize a head-to-head history into one record row per opponent"""
+    if h2h_history.empty:
+        return pd.DataFrame()
+
+    games = h2h_history.assign(
+        Win=h2h_history['Result'] == 'Win',
+        Loss=h2h_history['Result'] == 'Loss',
+        Tie=h2h_history['Result'] == 'Tie',
+        Playoff=h2h_history['Type'] == 'Playoffs'
+    )
+    rivalries = games.groupby('opponent_id').agg(**{
+        'Meetings': ('Result', 'size'),
+        'Wins': ('Win', 'sum'),
+        'Losses': ('Loss', 'sum'),
+        'Ties': ('Tie', 'sum'),
+        'Points For': ('User Score', 'sum'),
+        'Points Against': ('Opponent Score', 'sum'),
+        'Playoff Meetings': ('Playoff', 'sum')
+    }).reset_index()
+
+    rivalries.insert(0, 'Manager', rivalries['opponent_id'].map(manager_mapping).fillna('Unknown'))
+    rivalries[['Points For', 'Points Against']] = rivalries[['Points For', 'Points Against']].round(1)
+    return rivalries.sort_values(['Meetings', 'Wins'], ascending=False).drop(columns=['opponent_id'])
+
+
+def create_leaderboard_df(standings_df, manager_mapping):
+    """Career totals for every manager in a set of leagues, one row per manager"""
+    if standings_df.empty:
+        return pd.DataFrame()
+
+    leaderboard = standings_df.dropna(subset=['owner_id']).groupby('owner_id').agg(**{
+        'Seasons': ('league_id', 'size'),
+        'Championships': ('Is Champion', 'sum'),
+        'Regular Season Wins': ('Is Regular Season Winner', 'sum'),
+        'Top 6 Finishes': ('In Top 6', 'sum'),
+        'Bottom 4 Finishes': ('In Bottom 4', 'sum'),
+        'Average Standing': ('Standing', 'mean'),
+        'Games +/-': ('Games Above 500', 'sum')
+    }).reset_index()
 
-    return total_stats
\ No newline at end of file
+    leaderboard.insert(0, 'Manager', leaderboard['owner_id'].map(manager_mapping).fillna('Unknown'))
+    leaderboard['Average Standing'] = leaderboard['Average Standing'].round(1)
+    return leaderboard.sort_values(
+        ['Championships', 'Regular Season Wins', 'Average Standing'],
+        ascending=[False, False, True]
+    ).drop(columns=['owner_id'])
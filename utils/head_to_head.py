@@ -0,0 +1,100 @@
+# utils/head_to_head.py
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+SEASON_RECORD_COLUMNS = ['Season', 'Wins', 'Losses', 'Ties', 'Points For', 'Points Against']
+SPLIT_COLUMNS = ['Type', 'Meetings', 'Wins', 'Losses', 'Ties', 'Avg Points For', 'Avg Points Against']
+
+# Winning (or losing) margin buckets for the distribution table
+MARGIN_BINS = [0, 10, 25, 50, np.inf]
+MARGIN_LABELS = ['Under 10', '10–25', '25–50', '50+']
+
+
+class HeadToHeadStats(NamedTuple):
+    meetings: int
+    wins: int
+    losses: int
+    ties: int
+    current_streak: str  # e.g. 'W3'; empty when there are no games
+    longest_win_streak: int
+    longest_loss_streak: int
+    avg_points_for: float
+    avg_points_against: float
+    avg_margin: float
+    largest_win: float
+    largest_loss: float
+    margins: pd.DataFrame  # Meetings per margin bucket, split into wins and losses
+    seasons: pd.DataFrame  # One record row per season, newest first
+    splits: pd.DataFrame  # Regular season vs playoff records
+
+
+def _chronological(games: pd.DataFrame) -> pd.DataFrame:
+    """Oldest game first; 'week' orders playoff rounds after the regular season"""
+    order = ['Season', 'week'] if 'week' in games.columns else ['Season']
+    return games.sort_values(order, kind='stable').reset_index(drop=True)
+
+
+def compute_head_to_head_stats(games: pd.DataFrame) -> HeadToHeadStats:
+    """
+    Every head-to-head figure the summary shows, from one pass over the
+    game frame: totals, streaks, averages, margins, season records and
+    regular season vs playoff splits.
+    Args:
+        games: Completed games in the analyze_head_to_head_optimized shape
+    """
+    games = _chronological(games)
+    result = games['Result']
+    margin = games['User Score'] - games['Opponent Score']
+    flags = pd.DataFrame({
+        'Wins': result == 'Win',
+        'Losses': result == 'Loss',
+        'Ties': result == 'Tie',
+        'Points For': games['User Score'],
+        'Points Against': games['Opponent Score']
+    })
+
+    # Streaks: consecutive runs of the same result, numbered by where the result changes
+    runs = result.groupby((result != result.shift()).cumsum()).agg(['first', 'size'])
+    run_lengths = runs.groupby('first')['size'].max()
+    current_streak = f"{runs['first'].iloc[-1][0]}{runs['size'].iloc[-1]}" if len(runs) else ''
+
+    seasons = flags.groupby(games['Season']).sum().reset_index()
+    seasons[['Wins', 'Losses', 'Ties']] = seasons[['Wins', 'Losses', 'Ties']].astype(int)
+    seasons[['Points For', 'Points Against']] = seasons[['Points For', 'Points Against']].round(1)
+    seasons = seasons.reindex(columns=SEASON_RECORD_COLUMNS).sort_values('Season', ascending=False)
+
+    game_type = games['Type'] if 'Type' in games.columns else pd.Series('Regular Season', index=games.index)
+    splits = flags.groupby(game_type).agg(**{
+        'Meetings': ('Wins', 'size'),
+        'Wins': ('Wins', 'sum'),
+        'Losses': ('Losses', 'sum'),
+        'Ties': ('Ties', 'sum'),
+        'Avg Points For': ('Points For', 'mean'),
+        'Avg Points Against': ('Points Against', 'mean')
+    }).rename_axis('Type').reset_index().round(1).reindex(columns=SPLIT_COLUMNS)
+
+    bucket = pd.cut(margin.abs(), MARGIN_BINS, labels=MARGIN_LABELS, include_lowest=True)
+    margins = pd.crosstab(bucket, np.where(margin > 0, 'Wins', np.where(margin < 0, 'Losses', 'Ties')))
+    margins = margins.reindex(index=MARGIN_LABELS, columns=['Wins', 'Losses'], fill_value=0)
+    margins = margins.rename_axis('Margin').rename_axis(None, axis=1).reset_index()
+
+    totals = flags[['Wins', 'Losses', 'Ties']].sum()
+    return HeadToHeadStats(
+        meetings=len(games),
+        wins=int(totals['Wins']),
+        losses=int(totals['Losses']),
+        ties=int(totals['Ties']),
+        current_streak=current_streak,
+        longest_win_streak=int(run_lengths.get('Win', 0)),
+        longest_loss_streak=int(run_lengths.get('Loss', 0)),
+        avg_points_for=round(float(games['User Score'].mean()), 1) if len(games) else 0.0,
+        avg_points_against=round(float(games['Opponent Score'].mean()), 1) if len(games) else 0.0,
+        avg_margin=round(float(margin.mean()), 1) if len(games) else 0.0,
+        largest_win=round(float(margin.max()), 1) if (margin > 0).any() else 0.0,
+        largest_loss=round(float(-margin.min()), 1) if (margin < 0).any() else 0.0,
+        margins=margins,
+        seasons=seasons,
+        splits=splits
+    )
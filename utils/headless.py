@@ -0,0 +1,12 @@
+# utils/headless.py
+import streamlit as st
+from streamlit import logger as streamlit_logger
+
+
+def quiet_streamlit_logger():
+    """
+    Silence Streamlit's warnings when cached helpers or scripts run without a
+    server (tests, benchmarks), where it warns on every cached call.
+    """
+    st.get_option('logger.level')  # Parses the config now, which would otherwise reset the level later
+    streamlit_logger.set_log_level('error')
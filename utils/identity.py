@@ -0,0 +1,127 @@
+# utils/identity.py
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.api import get_user_id
+from utils.response_store import STORE_FILE
+from utils.sqlite_store import SQLiteStore
+
+USERNAME_TTL = 24 * 3600  # Usernames can be changed, so resolved IDs are rechecked daily
+NOT_FOUND_TTL = 300  # Seconds a username Sleeper doesn't know is remembered
+
+
+class IdentityIndex(SQLiteStore):
+    """
+    Persistent index of Sleeper identities: username -> user_id (including
+    usernames that were not found) and, per league, each member's user_id,
+    season and display name. Leagues are indexed once from the cached league
+    info; live leagues are re-indexed so name changes show up.
+    """
+
+    def __init__(self, path: str = STORE_FILE):
+        super().__init__(path)
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS usernames (
+                username TEXT PRIMARY KEY,
+                user_id TEXT,
+                checked_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS league_members (
+                league_id TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                season INTEGER NOT NULL,
+                display_name TEXT NOT NULL,
+                PRIMARY KEY (league_id, user_id)
+            );
+            CREATE INDEX IF NOT EXISTS league_members_user ON league_members (user_id);
+            CREATE TABLE IF NOT EXISTS indexed_leagues (
+                league_id TEXT PRIMARY KEY,
+                complete INTEGER NOT NULL
+            );
+        """)
+
+    def resolve_username(self, username: str) -> Optional[str]:
+        """
+        Username -> user_id, served from the index when known (or known to be
+        missing). A lookup that fails raises and is not recorded.
+        """
+        key = username.strip().lower()
+        row = self._connection().execute(
+            "SELECT user_id, checked_at FROM usernames WHERE username = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            user_id, checked_at = row
+            ttl = USERNAME_TTL if user_id else NOT_FOUND_TTL
+            if time.time() - checked_at < ttl:
+                return user_id
+
+        user_id = get_user_id(username)
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO usernames (username, user_id, checked_at) VALUES (?, ?, ?)",
+            (key, user_id, time.time())
+        )
+        conn.commit()
+        return user_id
+
+    def unindexed(self, league_ids: Iterable[str]) -> List[str]:
+        """Leagues that still need indexing: never seen, or not yet complete"""
+        league_ids = [str(league_id) for league_id in league_ids]
+        complete = {
+            league_id for (league_id,) in self._connection().execute(
+                f"SELECT league_id FROM indexed_leagues WHERE complete = 1 "
+                f"AND league_id IN ({','.join('?' * len(league_ids))})",
+                league_ids
+            )
+        } if league_ids else set()
+        return [league_id for league_id in league_ids if league_id not in complete]
+
+    def index_leagues(self, league_infos: Iterable[Tuple[str, dict]]):
+        """Record every member of each (league_id, cached league info) pair"""
+        conn = self._connection()
+        for league_id, league_info in league_infos:
+            league_data = (league_info or {}).get('league_data')
+            users = (league_info or {}).get('users')
+            if not league_data or not users:
+                continue
+            season = int(league_data.get('season', '0'))
+            conn.executemany(
+                "INSERT OR REPLACE INTO league_members (league_id, user_id, season, display_name) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (str(league_id), user['user_id'], season, user.get('display_name', 'Unknown'))
+                    for user in users if user.get('user_id')
+                ]
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO indexed_leagues (league_id, complete) VALUES (?, ?)",
+                (str(league_id), int(league_data.get('status') == 'complete'))
+            )
+        conn.commit()
+
+    def display_names(self, user_id: str) -> Dict[int, str]:
+        """A user's display name in each season they were seen"""
+        rows = self._connection().execute(
+            "SELECT season, display_name FROM league_members WHERE user_id = ? ORDER BY season",
+            (user_id,)
+        ).fetchall()
+        return dict(rows)
+
+    def latest_display_names(self, league_ids: Iterable[str]) -> Dict[str, str]:
+        """Every member of the given leagues mapped to their most recent display name there"""
+        league_ids = [str(league_id) for league_id in league_ids]
+        if not league_ids:
+            return {}
+        rows = self._connection().execute(
+            f"SELECT user_id, display_name FROM league_members "
+            f"WHERE league_id IN ({','.join('?' * len(league_ids))}) ORDER BY season",
+            league_ids
+        )
+        # Later seasons overwrite earlier ones
+        return {user_id: display_name for user_id, display_name in rows}
+
+
+identity_index = IdentityIndex()
@@ -0,0 +1,298 @@
+# utils/metrics.py
+import bisect
+import os
+import re
+import threading
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from utils.rate_limit import rate_limiter
+
+METRICS_PORT_ENV = 'SLEEPER_METRICS_PORT'  # Set to serve /metrics as plain text on this port
+
+# Upper bounds (ms) of the API latency histogram buckets; the last one catches the rest
+LATENCY_BUCKETS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf')]
+
+_ID_SEGMENT = re.compile(r'^\d+$')
+
+
+def endpoint_name(url: str, base_url: str) -> str:
+    """
+    Collapse a request URL to its endpoint template so metrics stay bounded:
+    league/123/matchups/4 -> league/{id}/matchups/{n}. Other hosts are
+    reported by host name.
+    """
+    url = url.split('?')[0]
+    if not url.startswith(base_url + '/'):
+        return urlsplit(url).netloc
+    segments = url[len(base_url) + 1:].split('/')
+    if segments[0] in ('user', 'league') and len(segments) > 1:
+        segments[1] = '{id}'
+    return '/'.join('{n}' if _ID_SEGMENT.match(segment) else segment for segment in segments)
+
+
+class _EndpointStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.not_modified = 0
+        self.bytes = 0
+        self.total_ms = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of calls"""
+        if not self.calls:
+            return None
+        target = fraction * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= target:
+                return bound
+        return LATENCY_BUCKETS[-1]
+
+
+class RunMetrics:
+    """
+    Calls and cache lookups made on behalf of one script run: by its thread
+    and by the pool workers it fans out to, which inherit the run through the
+    copied context. Other sessions and background threads are not counted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints: Dict[str, Dict[str, float]] = {}
+        self.caches: Dict[str, Dict[str, int]] = {}
+
+    def _call(self, endpoint: str, status: Optional[int], elapsed_ms: float, size: int):
+        with self._lock:
+            stats = self.endpoints.setdefault(
+                endpoint, {'calls': 0, 'errors': 0, 'not_modified': 0, 'bytes': 0, 'total_ms': 0.0}
+            )
+            stats['calls'] += 1
+            stats['bytes'] += size
+            stats['total_ms'] = round(stats['total_ms'] + elapsed_ms, 1)
+            if status == 304:
+                stats['not_modified'] += 1
+            elif status is None or status >= 400:
+                stats['errors'] += 1
+
+    def _cache(self, cache: str, hit: Optional[bool]):
+        """hit None turns a lookup already counted as a hit into a miss"""
+        with self._lock:
+            counts = self.caches.setdefault(cache, {'hits': 0, 'misses': 0})
+            if hit is None:
+                counts['hits'] -= 1
+                counts['misses'] += 1
+            else:
+                counts['hits' if hit else 'misses'] += 1
+
+    def snapshot(self) -> dict:
+        """Per-endpoint and per-cache counts, shaped like diff_snapshots' result"""
+        with self._lock:
+            return {
+                'endpoints': {endpoint: dict(stats) for endpoint, stats in self.endpoints.items()},
+                'caches': {cache: dict(counts) for cache, counts in self.caches.items()}
+            }
+
+
+_run: ContextVar[Optional[RunMetrics]] = ContextVar('metrics_run', default=None)
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters for Sleeper API calls (per endpoint template:
+    calls, errors, 304s, bytes received and a latency histogram) and for
+    cache layers (hits and misses per cache). Cheap enough to leave on:
+    each record is a dict lookup and a few additions under one lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _EndpointStats] = {}
+        self._caches: Dict[str, Dict[str, int]] = {}
+
+    def record_call(self, endpoint: str, status: Optional[int], elapsed_ms: float, size: int = 0):
+        """One API attempt; status None means the request raised"""
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = _EndpointStats()
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.bytes += size
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed_ms)] += 1
+            if status == 304:
+                stats.not_modified += 1
+            elif status is None or status >= 400:
+                stats.errors += 1
+        run = _run.get()
+        if run is not None:
+            run._call(endpoint, status, elapsed_ms, size)
+
+    def record_cache(self, cache: str, hit: bool):
+        with self._lock:
+            counts = self._caches.setdefault(cache, {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += 1
+        run = _run.get()
+        if run is not None:
+            run._cache(cache, hit)
+
+    def cache_miss(self, cache: str):
+        """Turn a lookup already counted as a hit into a miss, once the cache had to load"""
+        with self._lock:
+            counts = self._caches.setdefault(cache, {'hits': 0, 'misses': 0})
+            counts['hits'] -= 1
+            counts['misses'] += 1
+        run = _run.get()
+        if run is not None:
+            run._cache(cache, None)
+
+    def begin_run(self) -> RunMetrics:
+        """
+        Start counting the current script run on its own, alongside the
+        process totals. Set at the top of every run, since Streamlit reuses
+        the script thread across reruns.
+        """
+        run = RunMetrics()
+        _run.set(run)
+        return run
+
+    def snapshot(self) -> dict:
+        """Plain-dict copy of every counter, safe to keep and diff later"""
+        with self._lock:
+            endpoints = {
+                endpoint: {
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'not_modified': stats.not_modified,
+                    'bytes': stats.bytes,
+                    'total_ms': round(stats.total_ms, 1),
+                    'p50_ms': stats.percentile(0.5),
+                    'p95_ms': stats.percentile(0.95),
+                    'buckets': list(stats.buckets)
+                }
+                for endpoint, stats in self._endpoints.items()
+            }
+            caches = {cache: dict(counts) for cache, counts in self._caches.items()}
+        return {'endpoints': endpoints, 'caches': caches, 'rate_limiter': rate_limiter.metrics()}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._caches.clear()
+
+    def render_text(self) -> str:
+        """Counters in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        endpoints = snapshot['endpoints'].items()
+        metric('sleeper_api_calls_total', 'counter', "Sleeper API attempts by endpoint",
+               [({'endpoint': e}, s['calls']) for e, s in endpoints])
+        metric('sleeper_api_errors_total', 'counter', "Failed Sleeper API attempts by endpoint",
+               [({'endpoint': e}, s['errors']) for e, s in endpoints])
+        metric('sleeper_api_not_modified_total', 'counter', "Revalidations answered with 304",
+               [({'endpoint': e}, s['not_modified']) for e, s in endpoints])
+        metric('sleeper_api_received_bytes_total', 'counter', "Response bytes received by endpoint",
+               [({'endpoint': e}, s['bytes']) for e, s in endpoints])
+
+        lines.append("# HELP sleeper_api_latency_ms Sleeper API attempt latency in milliseconds")
+        lines.append("# TYPE sleeper_api_latency_ms histogram")
+        for endpoint, stats in endpoints:
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats['buckets']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else bound
+                lines.append(f'sleeper_api_latency_ms_bucket{{endpoint="{endpoint}",le="{le}"}} {cumulative}')
+            lines.append(f'sleeper_api_latency_ms_sum{{endpoint="{endpoint}"}} {stats["total_ms"]}')
+            lines.append(f'sleeper_api_latency_ms_count{{endpoint="{endpoint}"}} {stats["calls"]}')
+
+        caches = snapshot['caches'].items()
+        metric('sleeper_cache_hits_total', 'counter', "Cache lookups served from the cache",
+               [({'cache': c}, counts['hits']) for c, counts in caches])
+        metric('sleeper_cache_misses_total', 'counter', "Cache lookups that had to load",
+               [({'cache': c}, counts['misses']) for c, counts in caches])
+
+        limiter = snapshot['rate_limiter']
+        metric('sleeper_rate_limit_granted_total', 'counter', "Rate limiter tokens granted by priority",
+               [({'priority': p}, s['granted']) for p, s in limiter['priorities'].items()])
+        metric('sleeper_rate_limit_wait_seconds_total', 'counter', "Time spent waiting for a token by priority",
+               [({'priority': p}, round(s['wait_seconds'], 3)) for p, s in limiter['priorities'].items()])
+        metric('sleeper_rate_limit_throttled_total', 'counter', "429 responses that paused all callers",
+               [({}, limiter['throttled'])])
+        metric('sleeper_rate_limit_queued', 'gauge', "Callers waiting for a token",
+               [({}, limiter['queued'])])
+        return '\n'.join(lines) + '\n'
+
+
+def diff_snapshots(before: dict, after: dict) -> dict:
+    """Per-endpoint calls, errors, bytes and time, and per-cache hits/misses, between two snapshots"""
+    def delta(old, new, keys):
+        return {key: round(new[key] - (old or {}).get(key, 0), 1) for key in keys}
+
+    endpoints = {
+        endpoint: delta(before['endpoints'].get(endpoint), stats,
+                        ('calls', 'errors', 'not_modified', 'bytes', 'total_ms'))
+        for endpoint, stats in after['endpoints'].items()
+    }
+    caches = {
+        cache: delta(before['caches'].get(cache), counts, ('hits', 'misses'))
+        for cache, counts in after['caches'].items()
+    }
+    return {
+        'endpoints': {endpoint: stats for endpoint, stats in endpoints.items() if stats['calls']},
+        'caches': {cache: counts for cache, counts in caches.items() if counts['hits'] or counts['misses']}
+    }
+
+
+metrics = MetricsRegistry()
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = '0.0.0.0') -> ThreadingHTTPServer:
+    """
+    Serve metrics.render_text() at /metrics from a daemon thread, for
+    monitoring to scrape. Starting it again returns the running server.
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if urlsplit(self.path).path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render_text().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        _server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
+
+
+def serve_metrics_from_env() -> Optional[ThreadingHTTPServer]:
+    """Start the metrics endpoint if SLEEPER_METRICS_PORT is set"""
+    port = os.environ.get(METRICS_PORT_ENV)
+    return start_metrics_server(int(port)) if port else None
@@ -1,29 +1,139 @@
 # utils/nfl_calendar.py
-import requests 
-import streamlit as st
-from datetime import datetime, timezone
-from typing import Tuple
+import threading
+import time
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional, Tuple
 
-def get_current_nfl_week() -> Tuple[str, str, int]:
-    today = datetime.now()
-    st.sidebar.info(f"Today's date: {today.strftime('%Y-%m-%d')}")
-    
+from utils.rate_limit import BACKGROUND, request_priority
+from utils.response_store import LIVE_TTL
+
+REFRESH_INTERVAL = LIVE_TTL  # Seconds before the Sleeper state is re-read in the background
+RETRY_INTERVAL = 60  # Seconds before a failed refresh is retried; the last answer is kept meanwhile
+SEASON_TYPES = ('pre', 'regular', 'post', 'off')
+
+
+class NflWeek(NamedTuple):
+    season: str
+    season_type: str  # One of SEASON_TYPES
+    week: int  # 0 in the offseason
+    league_season: str  # Season new leagues are created for; the next one during the offseason
+    source: str  # 'sleeper' or 'schedule'
+
+
+class ScheduleWeek(NamedTuple):
+    season_type: str
+    week: int
+    start: date  # Weeks run Tuesday to Monday
+    end: date  # Exclusive
+
+
+def _labor_day(year: int) -> date:
+    september = date(year, 9, 1)
+    return september + timedelta(days=(0 - september.weekday()) % 7)
+
+
+def season_schedule(season: int) -> List[ScheduleWeek]:
+    """
+    The NFL calendar for a season, computed from the league's scheduling
+    rules rather than fetched: the opener is the Thursday after Labor Day,
+    with 18 regular season weeks and 3 preseason weeks since 2021 (17 and 4
+    before), then four playoff weeks with a bye before the Super Bowl.
+    Playoff weeks continue the regular season numbering.
+    """
+    regular_weeks, preseason_weeks = (18, 3) if season >= 2021 else (17, 4)
+    week_one = _labor_day(season) + timedelta(days=1)
+    weeks = [
+        ScheduleWeek('pre', week, week_one - timedelta(weeks=preseason_weeks - week + 1),
+                     week_one - timedelta(weeks=preseason_weeks - week))
+        for week in range(1, preseason_weeks + 1)
+    ]
+    weeks += [
+        ScheduleWeek('regular', week, week_one + timedelta(weeks=week - 1), week_one + timedelta(weeks=week))
+        for week in range(1, regular_weeks + 1)
+    ]
+    for round_number in range(1, 5):
+        start = weeks[-1].end
+        length = 2 if round_number == 4 else 1  # The Super Bowl follows a week off
+        weeks.append(ScheduleWeek('post', regular_weeks + round_number, start, start + timedelta(weeks=length)))
+    return weeks
+
+
+def schedule_week(day: Optional[date] = None) -> NflWeek:
+    """Where a day falls in the computed NFL calendar; no network involved"""
+    day = day or date.today()
+    season = day.year if day >= season_schedule(day.year)[0].start else day.year - 1
+    for week in season_schedule(season):
+        if week.start <= day < week.end:
+            return NflWeek(str(season), week.season_type, week.week, str(season), 'schedule')
+    return NflWeek(str(season), 'off', 0, str(season + 1), 'schedule')
+
+
+def _from_sleeper_state(state) -> Optional[NflWeek]:
+    """The Sleeper state as an NflWeek, or None if it is missing or malformed"""
+    if not isinstance(state, dict):
+        return None
+    season_type = state.get('season_type')
+    if not state.get('season') or season_type not in SEASON_TYPES:
+        return None
     try:
-        response = requests.get("https://api.nfl.com/v3/shield/?query=query%7Bviewer%7Bcurrent%7Bweek%7D%7D%7D",
-                              headers={"Client-ID": "d5c67b30-6f1d-451e-9bcd-dc4da919f973"})
-        if response.status_code == 200:
-            week = response.json()['data']['viewer']['current']['week']
-            st.sidebar.info(f"NFL API: Week {week}, Year {today.year}")
-            return str(today.year), 'regular', week
-    except Exception as e:
-        st.sidebar.warning(f"NFL API Error: {str(e)}")
-    
-    # Fallback calculation for 2024 season (starts Sept 5, 2024)
-    season_start = datetime(2024, 9, 5)
-    if today >= season_start:
-        week = ((today - season_start).days // 7) + 1
-    else:
-        week = 12  # Current week as of Nov 25, 2024
-        
-    st.sidebar.warning(f"Using fallback: Week {week}, Year {today.year}")
-    return str(today.year), 'regular', week
+        week = int(state.get('week') or 0)
+    except (TypeError, ValueError):
+        return None
+    season = str(state['season'])
+    return NflWeek(season, season_type, week, str(state.get('league_season') or season), 'sleeper')
+
+
+class NflCalendar:
+    """
+    The current NFL season, season type and week, answered from memory.
+    Until the Sleeper state has been read the answer comes from the computed
+    schedule; the state is then refreshed on a background thread every
+    REFRESH_INTERVAL seconds, so a slow or failing upstream never holds up
+    a caller.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current: Optional[NflWeek] = None
+        self._next_refresh = 0.0
+        self._refreshing = False
+
+    def current(self) -> NflWeek:
+        with self._lock:
+            current = self._current
+            if not self._refreshing and time.monotonic() >= self._next_refresh:
+                self._refreshing = True
+                threading.Thread(target=self.refresh, name="nfl-calendar-refresh", daemon=True).start()
+        return current or schedule_week()
+
+    def refresh(self) -> Optional[NflWeek]:
+        """
+        Read the Sleeper state now, on the calling thread. current() does this
+        in the background; call it directly only where waiting is fine, e.g. to
+        pin the calendar before a benchmark. Returns None if the read failed.
+        """
+        # Imported here to keep this module light. Read uncached: a cache with the same
+        # lifetime as REFRESH_INTERVAL could hand back the previous state and miss a rollover
+        from utils.api import get_nfl_state
+
+        week = None
+        try:
+            with request_priority(BACKGROUND):
+                week = _from_sleeper_state(get_nfl_state())
+        except Exception as e:
+            print(f"Error refreshing NFL state: {e}")
+        with self._lock:
+            if week is not None:
+                self._current = week
+            self._next_refresh = time.monotonic() + (REFRESH_INTERVAL if week is not None else RETRY_INTERVAL)
+            self._refreshing = False
+        return week
+
+
+nfl_calendar = NflCalendar()
+
+
+def get_current_nfl_week() -> Tuple[str, str, int]:
+    """(season, season_type, week) right now, without waiting on the network"""
+    current = nfl_calendar.current()
+    return current.season, current.season_type, current.week
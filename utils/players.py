@@ -1,41 +1,189 @@
 # utils/players.py
 import json
 import os
+import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
+
 import requests
 
-CACHE_FILE = "utils/players_cache.json"
+from utils.api import BASE_URL, get_client
+from utils.rate_limit import BACKGROUND
+
+DB_FILE = "utils/players.sqlite3"
 CACHE_DURATION = timedelta(days=1)
+LOCK_TIMEOUT = 600  # Seconds after which another process's refresh lock is considered stale
+CHUNK_SIZE = 64 * 1024
+
+PLAYER_FIELDS = ('name', 'position', 'team', 'status')
+
+
+def _iter_object_items(chunks):
+    """Yield (key, value) pairs of a top-level JSON object from text chunks without loading it whole"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+        while True:
+            # Skip whitespace, the opening brace and item separators
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n{,':
+                pos += 1
+            if pos >= len(buffer) or buffer[pos] == '}':
+                break
+            try:
+                key, end = decoder.raw_decode(buffer, pos)
+                value_start = buffer.index(':', end) + 1
+                while value_start < len(buffer) and buffer[value_start] in ' \t\r\n':
+                    value_start += 1
+                value, end = decoder.raw_decode(buffer, value_start)
+            except ValueError:
+                break  # The item is cut off at the end of the chunk; wait for more data
+            if end >= len(buffer) or buffer[end] not in ' \t\r\n,}':
+                # Only a delimiter proves the value is whole: a number cut by the chunk
+                # boundary ('12' of '12345', '-1' of '-1.5e3') decodes too
+                break
+            yield key, value
+            pos = end
+        buffer = buffer[pos:]
+
+
+def _player_row(player_id, player):
+    """Reduce a full Sleeper player record to the fields the dashboard uses"""
+    name = player.get('full_name') or f"{player.get('first_name') or ''} {player.get('last_name') or ''}".strip()
+    return (player_id, name, player.get('position'), player.get('team'), player.get('status'))
+
+
+class PlayerLookup:
+    """Read-only, dict-like view of the player store that queries one player at a time"""
+
+    def __init__(self, cache):
+        self._cache = cache
+
+    def get(self, player_id, default=None):
+        player = self._cache.get_player(player_id)
+        return default if player is None else player
+
+    def __getitem__(self, player_id):
+        player = self._cache.get_player(player_id)
+        if player is None:
+            raise KeyError(player_id)
+        return player
+
+    def __contains__(self, player_id):
+        return self._cache.get_player(player_id) is not None
+
 
 class PlayerCache:
-    @staticmethod
-    def get_players():
-        if not os.path.exists(CACHE_FILE):
-            return PlayerCache._update_cache()
-        
-        file_time = datetime.fromtimestamp(os.path.getmtime(CACHE_FILE))
-        if datetime.now() - file_time > CACHE_DURATION:
-            return PlayerCache._update_cache()
-        
-        try:
-            with open(CACHE_FILE, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error reading cache: {e}")
-            return PlayerCache._update_cache()
-
-    @staticmethod
-    def _update_cache():
+    """
+    Compact on-disk player database: one SQLite row per player holding only
+    name, position, team and status. Refreshes stream the /players/nfl dump
+    into a new file that is swapped in atomically, so readers never see a
+    half-written store and nothing holds the full dump in memory.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._refresh_lock = threading.Lock()
+
+    def _connection(self):
+        # Reconnect when a refresh has swapped a new file in under this thread
+        inode = os.stat(self.path).st_ino
+        if getattr(self._local, 'inode', None) != inode:
+            if getattr(self._local, 'conn', None) is not None:
+                self._local.conn.close()
+            self._local.conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            self._local.inode = inode
+        return self._local.conn
+
+    def _is_fresh(self):
+        if not os.path.exists(self.path):
+            return False
+        file_time = datetime.fromtimestamp(os.path.getmtime(self.path))
+        return datetime.now() - file_time <= CACHE_DURATION
+
+    def get_players(self):
+        """Return a lazy player_id lookup, refreshing the store first if it is stale"""
+        if not self._is_fresh():
+            self._update_cache()
+        return PlayerLookup(self)
+
+    def get_player(self, player_id):
+        """Look up a single player's fields, or None if unknown"""
+        if not os.path.exists(self.path):
+            return None
+        row = self._connection().execute(
+            "SELECT name, position, team, status FROM players WHERE player_id = ?",
+            (str(player_id),)
+        ).fetchone()
+        return dict(zip(PLAYER_FIELDS, row)) if row else None
+
+    def _acquire_file_lock(self, lock_path):
+        """Take the cross-process refresh lock; False if another process holds it"""
         try:
-            response = requests.get("https://api.sleeper.app/v1/players/nfl")
-            if response.status_code == 200:
-                players = response.json()
-                os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-                with open(CACHE_FILE, 'w') as f:
-                    json.dump(players, f)
-                return players
-        except Exception as e:
-            print(f"Error updating cache: {e}")
-            return {}
-
-player_cache = PlayerCache()
\ No newline at end of file
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if time.time() - os.path.getmtime(lock_path) > LOCK_TIMEOUT:
+                os.remove(lock_path)
+                return self._acquire_file_lock(lock_path)
+            return False
+        os.close(fd)
+        return True
+
+    def _update_cache(self):
+        with self._refresh_lock:
+            if self._is_fresh():
+                return  # Another session refreshed while we waited
+
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            lock_path = f"{self.path}.lock"
+            if not self._acquire_file_lock(lock_path):
+                return  # Another process is refreshing; keep serving the current store
+
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                self._build(tmp_path)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"Error updating cache: {e}")
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                os.remove(lock_path)
+
+    def _build(self, path):
+        """Stream the players dump into a fresh SQLite file at path"""
+        with get_client().get(f"{BASE_URL}/players/nfl", priority=BACKGROUND, stream=True) as response:
+            if response.status_code != 200:
+                raise requests.HTTPError(f"players/nfl returned {response.status_code}")
+            response.encoding = response.encoding or 'utf-8'
+
+            conn = sqlite3.connect(path)
+            try:
+                conn.execute("""
+                    CREATE TABLE players (
+                        player_id TEXT PRIMARY KEY,
+                        name TEXT,
+                        position TEXT,
+                        team TEXT,
+                        status TEXT
+                    ) WITHOUT ROWID
+                """)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO players VALUES (?, ?, ?, ?, ?)",
+                    (
+                        _player_row(player_id, player)
+                        for player_id, player in _iter_object_items(
+                            response.iter_content(chunk_size=CHUNK_SIZE, decode_unicode=True)
+                        )
+                        if isinstance(player, dict)
+                    )
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+
+player_cache = PlayerCache()
@@ -0,0 +1,85 @@
+# utils/prefetch.py
+import threading
+import time
+from functools import partial
+from typing import Dict, Iterable, Tuple
+
+from utils.concurrency import run_parallel
+from utils.data_cache import get_cached_league_info, get_cached_league_matchups
+from utils.rate_limit import BACKGROUND, request_priority
+from utils.response_store import LIVE_TTL
+
+# Leagues warmed at once. Each league fans out over its weeks, so this bounds threads rather
+# than requests: those share the client's POOL_SIZE slots, and the rate limiter hands
+# tokens to interactive calls first
+PREFETCH_WORKERS = 4
+
+
+class PrefetchJob:
+    """Background warm-up of every league's matchups and bracket, with progress"""
+
+    def __init__(self, league_ids: Tuple[str, ...]):
+        self.league_ids = league_ids
+        self.total = len(league_ids)
+        self.completed = 0
+        self.failed = 0
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="matchup-prefetch", daemon=True)
+
+    @property
+    def progress(self) -> float:
+        return (self.completed + self.failed) / self.total if self.total else 1.0
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _warm(self, league_id: str):
+        try:
+            # League info carries the bracket; the matchup table pulls every week
+            get_cached_league_info(league_id)
+            get_cached_league_matchups(league_id)
+            with self._lock:
+                self.completed += 1
+        except Exception as e:
+            print(f"Error prefetching league {league_id}: {e}")
+            with self._lock:
+                self.failed += 1
+
+    def _run(self):
+        try:
+            # Queue behind anything a user is waiting on
+            with request_priority(BACKGROUND):
+                run_parallel([partial(self._warm, league_id) for league_id in self.league_ids],
+                             max_workers=PREFETCH_WORKERS)
+        finally:
+            self.finished_at = time.time()
+
+
+_jobs: Dict[Tuple[str, ...], PrefetchJob] = {}
+_jobs_lock = threading.Lock()
+
+
+def start_prefetch(league_ids: Iterable[str]) -> PrefetchJob:
+    """
+    Start warming matchup and bracket data for the given leagues in a
+    background thread and return its job. Sessions asking for the same
+    leagues share one job; finished jobs are reused until LIVE_TTL passes.
+    Never blocks the calling script thread.
+    """
+    key = tuple(sorted(set(league_ids)))
+    with _jobs_lock:
+        now = time.time()
+        for job_key, job in list(_jobs.items()):
+            if job.done and now - job.finished_at > LIVE_TTL:
+                del _jobs[job_key]
+
+        job = _jobs.get(key)
+        if job is None:
+            job = _jobs[key] = PrefetchJob(key).start()
+        return job
@@ -0,0 +1,126 @@
+# utils/rate_limit.py
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Priority classes, most urgent first
+INTERACTIVE = 0  # Lookups a user is waiting on: usernames, league lists
+DEFAULT = 1
+BACKGROUND = 2  # Crawls nobody is looking at yet: prefetch, player refresh
+
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', DEFAULT: 'default', BACKGROUND: 'background'}
+
+REQUESTS_PER_MINUTE = 900  # Stay under Sleeper's ~1000 calls/minute guidance
+BURST = 50  # Calls allowed back to back before the rate applies
+
+_priority = ContextVar('sleeper_request_priority', default=DEFAULT)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """Run the enclosed Sleeper calls (and any run_parallel tasks they spawn) at a priority class"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+class PriorityRateLimiter:
+    """
+    Process-wide token bucket shared by every session thread. Callers that
+    have to wait queue by priority class, so an interactive lookup jumps
+    ahead of a background crawl that is already waiting. Keeps counters of
+    grants, waits and throttling for the metrics panel.
+    """
+
+    def __init__(self, requests_per_minute: float = REQUESTS_PER_MINUTE, burst: int = BURST):
+        self.rate = requests_per_minute / 60
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._stats = {
+            priority: {'granted': 0, 'waited': 0, 'wait_seconds': 0.0}
+            for priority in PRIORITY_NAMES
+        }
+        self._throttled = 0
+
+    def configure(self, requests_per_minute: float = REQUESTS_PER_MINUTE, burst: int = BURST):
+        """Change the rate and burst in place, starting from a full bucket; waiters re-check at once"""
+        with self._cond:
+            self.rate = requests_per_minute / 60
+            self.burst = burst
+            self._tokens = float(burst)
+            self._updated = time.monotonic()
+            self._cond.notify_all()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = None) -> float:
+        """Block until a call may go out; returns the seconds spent waiting"""
+        priority = current_priority() if priority is None else priority
+        start = time.monotonic()
+        with self._cond:
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._waiters[0] == ticket and now >= self._paused_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    if self._waiters[0] != ticket:
+                        self._cond.wait()
+                    else:
+                        delay = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+                        self._cond.wait(timeout=delay)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            stats = self._stats.get(priority, self._stats[DEFAULT])
+            stats['granted'] += 1
+            if waited > 0.001:
+                stats['waited'] += 1
+                stats['wait_seconds'] += waited
+        return waited
+
+    def throttle(self, retry_after: float):
+        """The server said slow down: hold every caller back for retry_after seconds"""
+        with self._cond:
+            self._throttled += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            self._tokens = 0
+            self._cond.notify_all()
+
+    def metrics(self) -> dict:
+        """Snapshot of per-priority grants and waits plus server throttling"""
+        with self._cond:
+            return {
+                'priorities': {
+                    PRIORITY_NAMES[priority]: dict(stats)
+                    for priority, stats in self._stats.items()
+                },
+                'throttled': self._throttled,
+                'queued': len(self._waiters),
+                'tokens': round(self._tokens, 2)
+            }
+
+
+rate_limiter = PriorityRateLimiter()
@@ -0,0 +1,108 @@
+# utils/response_store.py
+import json
+import sqlite3
+import time
+from typing import Any, NamedTuple, Optional
+
+from utils.sqlite_store import SQLiteStore
+
+STORE_FILE = "utils/sleeper_responses.sqlite3"
+LIVE_TTL = 600  # Seconds before data for an in-progress season is refetched
+NEVER_EXPIRES = None  # TTL for data that can no longer change
+
+
+class StoredResponse(NamedTuple):
+    value: Any
+    expired: bool
+    validators: dict  # ETag / Last-Modified for conditional revalidation
+
+
+class ResponseStore(SQLiteStore):
+    """
+    Persistent store for raw Sleeper API responses, keyed by endpoint and
+    parameters. Each entry carries its own expiry: completed seasons are
+    stored with NEVER_EXPIRES and survive restarts indefinitely, while live
+    data gets a short TTL.
+    """
+
+    def __init__(self, path: str = STORE_FILE):
+        super().__init__(path)
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                endpoint TEXT NOT NULL,
+                params TEXT NOT NULL,
+                body TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL,
+                etag TEXT,
+                last_modified TEXT,
+                PRIMARY KEY (endpoint, params)
+            )
+        """)
+        # Stores created before validators were kept
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(responses)")}
+        for column in ('etag', 'last_modified'):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE responses ADD COLUMN {column} TEXT")
+
+    @staticmethod
+    def _key(params) -> str:
+        return json.dumps(params, separators=(',', ':'))
+
+    def get_entry(self, endpoint: str, *params) -> Optional[StoredResponse]:
+        """Return the stored response even if expired, or None if it was never stored"""
+        row = self._connection().execute(
+            "SELECT body, expires_at, etag, last_modified FROM responses WHERE endpoint = ? AND params = ?",
+            (endpoint, self._key(params))
+        ).fetchone()
+        if row is None:
+            return None
+        body, expires_at, etag, last_modified = row
+        validators = {
+            key: value
+            for key, value in (('etag', etag), ('last_modified', last_modified))
+            if value
+        }
+        expired = expires_at is not None and expires_at < time.time()
+        return StoredResponse(json.loads(body), expired, validators)
+
+    def get(self, endpoint: str, *params) -> Optional[Any]:
+        """Return the stored response, or None if it is missing or expired"""
+        entry = self.get_entry(endpoint, *params)
+        if entry is None or entry.expired:
+            return None
+        return entry.value
+
+    def put(self, endpoint: str, *params, value: Any, ttl: Optional[float] = LIVE_TTL,
+            validators: Optional[dict] = None):
+        """Store a response; ttl=NEVER_EXPIRES keeps it forever. None values are not stored."""
+        if value is None:
+            return
+        validators = validators or {}
+        now = time.time()
+        expires_at = None if ttl is NEVER_EXPIRES else now + ttl
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(endpoint, params, body, fetched_at, expires_at, etag, last_modified) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (endpoint, self._key(params), json.dumps(value), now, expires_at,
+             validators.get('etag'), validators.get('last_modified'))
+        )
+        conn.commit()
+
+    def touch(self, endpoint: str, *params, ttl: Optional[float] = LIVE_TTL):
+        """Extend a stored response's expiry after the server confirmed it is unchanged"""
+        now = time.time()
+        expires_at = None if ttl is NEVER_EXPIRES else now + ttl
+        conn = self._connection()
+        conn.execute(
+            "UPDATE responses SET fetched_at = ?, expires_at = ? WHERE endpoint = ? AND params = ?",
+            (now, expires_at, endpoint, self._key(params))
+        )
+        conn.commit()
+
+
+response_store = ResponseStore()
@@ -0,0 +1,52 @@
+# utils/sqlite_store.py
+import os
+import sqlite3
+import threading
+
+
+class SQLiteStore:
+    """
+    Base for the stores kept in one SQLite file: a connection per thread and
+    a schema created on first use. Subclasses supply their DDL in
+    _create_schema.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def reopen(self, path: str):
+        """Switch to the database at path; every thread reconnects on its next call"""
+        with self._init_lock:
+            self.path = path
+            self._local = threading.local()
+            self._initialized = False
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self._ensure_schema()
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def _ensure_schema(self):
+        with self._init_lock:
+            if self._initialized:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                self._create_schema(conn)
+                conn.commit()
+            finally:
+                conn.close()
+            self._initialized = True
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        raise NotImplementedError
@@ -0,0 +1,77 @@
+# utils/standings.py
+from typing import Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+ROSTER_COLUMNS = ['Season', 'League', 'league_id', 'status', 'winner_roster_id',
+                  'roster_id', 'owner_id', 'roster_order', 'wins', 'losses', 'ties', 'fpts']
+
+PERFORMANCE_COLUMNS = ['Season', 'League', 'Games Above 500', 'Standing', 'Total Teams',
+                       'Is Regular Season Winner', 'Is Last', 'Is Champion', 'In Top 6', 'In Bottom 4',
+                       'league_id']
+
+
+def create_rosters_df(leagues: Iterable[Tuple[int, str, str, dict]]) -> pd.DataFrame:
+    """
+    Flatten the rosters of many leagues into one DataFrame.
+    Args:
+        leagues: (season, league name, league_id, cached league info) per league
+    """
+    rows = []
+    for season, league_name, league_id, league_info in leagues:
+        if not league_info or not league_info.get('rosters'):
+            continue
+        league_data = league_info.get('league_data')
+        league_data = league_data if isinstance(league_data, dict) else {}
+        metadata = league_data.get('metadata')
+        winner_roster_id = metadata.get('latest_league_winner_roster_id') if isinstance(metadata, dict) else None
+
+        for order, roster in enumerate(league_info['rosters']):
+            settings = roster.get('settings') or {}
+            rows.append((
+                season, league_name, league_id, league_data.get('status'),
+                str(winner_roster_id) if winner_roster_id else None,
+                roster['roster_id'], roster.get('owner_id'), order,
+                settings.get('wins', 0), settings.get('losses', 0), settings.get('ties', 0),
+                settings.get('fpts', 0) + settings.get('fpts_decimal', 0) / 100
+            ))
+    return pd.DataFrame(rows, columns=ROSTER_COLUMNS)
+
+
+def compute_standings(rosters_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rank every roster within its league with grouped operations and flag the
+    finishes the career summary tracks. Standing is ordered by wins, then
+    points for, then the league's roster order.
+    """
+    if rosters_df.empty:
+        return rosters_df.reindex(columns=ROSTER_COLUMNS + PERFORMANCE_COLUMNS[2:-1])
+
+    df = rosters_df.sort_values(
+        ['league_id', 'wins', 'fpts', 'roster_order'],
+        ascending=[True, False, False, True]
+    )
+    league = df.groupby('league_id', sort=False)
+    df['Standing'] = league.cumcount() + 1
+    df['Total Teams'] = league['roster_id'].transform('size')
+    df['Games Above 500'] = df['wins'] - df['losses']
+
+    standing = df['Standing']
+    total_teams = df['Total Teams']
+    large_league = total_teams >= 8
+    df['Is Regular Season Winner'] = standing == 1
+    df['Is Last'] = standing == total_teams
+    df['In Top 6'] = np.where(large_league, standing <= 6, standing <= total_teams * 0.75)
+    df['In Bottom 4'] = np.where(large_league, standing > total_teams - 4, standing > total_teams * 0.5)
+    df['Is Champion'] = (
+        (df['status'] == 'complete') &
+        (df['roster_id'].astype(str) == df['winner_roster_id'])
+    )
+    return df.sort_index()
+
+
+def get_owner_performance(standings_df: pd.DataFrame, owner_id: str) -> pd.DataFrame:
+    """One owner's performance rows in the shape the career summary and charts expect"""
+    performance = standings_df[standings_df['owner_id'] == owner_id].reindex(columns=PERFORMANCE_COLUMNS)
+    return performance.reset_index(drop=True)
@@ -0,0 +1,106 @@
+# utils/tracing.py
+import contextlib
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Optional
+
+_active: ContextVar[Optional['Trace']] = ContextVar('render_trace', default=None)
+_NOOP = contextlib.nullcontext()
+
+
+class Trace:
+    """Spans collected during one script run, exportable as Chrome trace-event JSON"""
+
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        self.events = []
+        self.threads = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start_ns: int, end_ns: int, args: dict):
+        thread = threading.current_thread()
+        with self._lock:
+            self.threads[thread.ident] = thread.name
+            self.events.append({
+                'name': name,
+                'ph': 'X',
+                'ts': (start_ns - self.origin) / 1000,
+                'dur': (end_ns - start_ns) / 1000,
+                'pid': os.getpid(),
+                'tid': thread.ident,
+                'args': args
+            })
+
+    def to_chrome_json(self) -> str:
+        """Trace-event JSON for chrome://tracing or Perfetto"""
+        with self._lock:
+            metadata = [
+                {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+                for tid, name in self.threads.items()
+            ]
+            events = metadata + sorted(self.events, key=lambda event: event['ts'])
+        return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'})
+
+
+class _Span:
+    __slots__ = ('trace', 'name', 'args', 'start')
+
+    def __init__(self, trace: Trace, name: str, args: dict):
+        self.trace = trace
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.trace.add(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+
+def span(name: str, **args):
+    """
+    Time the enclosed block as a span of the current run's trace. With no
+    trace active this returns a shared no-op context, so spans can stay in
+    hot paths.
+    """
+    trace = _active.get()
+    if trace is None:
+        return _NOOP
+    return _Span(trace, name, args)
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of span, named after the function by default"""
+    def decorate(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _active.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with _Span(trace, span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def begin_run(enabled: bool) -> Optional[Trace]:
+    """
+    Start (or switch off) tracing for the current script run. Always set at
+    the top of a run, since Streamlit reuses the script thread across reruns.
+    Worker threads pick the trace up through the copied context.
+    """
+    trace = Trace() if enabled else None
+    _active.set(trace)
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    return _active.get()
@@ -0,0 +1,227 @@
+# utils/transport.py
+"""
+Record/replay transports for the Sleeper client.
+
+    SLEEPER_TRANSPORT=record SLEEPER_FIXTURE=fixture.json streamlit run app.py
+    SLEEPER_TRANSPORT=replay SLEEPER_FIXTURE=fixture.json SLEEPER_REPLAY_LATENCY_MS=30 streamlit run app.py
+
+Record mode passes calls through to the network and saves every successful
+JSON response to the fixture. Replay mode answers from the fixture only, with
+optional simulated latency. The fixture can also be served over HTTP by a
+local stand-in, for load tools that need a real server:
+
+    python -m utils.transport fixture.json --port 8765
+    SLEEPER_BASE_URL=http://127.0.0.1:8765/v1 streamlit run app.py
+"""
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+LIVE, RECORD, REPLAY = 'live', 'record', 'replay'
+FLUSH_EVERY = 50  # New recordings between fixture writes; the rest are written at exit
+
+
+def fixture_key(url: str, base_url: str) -> str:
+    """Sleeper API paths are keyed relative to the base URL, anything else by full URL"""
+    url = url.split('?')[0]
+    if url.startswith(base_url + '/'):
+        return url[len(base_url) + 1:]
+    return url
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+class FixtureStore:
+    """Recorded responses as one JSON file of {fixture key: decoded body}"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self.responses: Dict[str, object] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.responses = json.load(f)
+
+    def get(self, key: str):
+        return self.responses.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.responses
+
+    def put(self, key: str, value):
+        with self._lock:
+            self.responses[key] = value
+            self._unsaved += 1
+            if self._unsaved < FLUSH_EVERY:
+                return
+        self.save()
+
+    def save(self):
+        with self._lock:
+            if not self._unsaved:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(self.responses, f, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+            self._unsaved = 0
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends calls to the network and records every 200 JSON response"""
+
+    def __init__(self, store: FixtureStore, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+        self.base_url = base_url
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if request.method == 'GET' and response.status_code == 200:
+            try:
+                # Reads a streamed body up front; iter_content then replays it
+                value = response.json()
+            except ValueError:
+                return response
+            self.store.put(fixture_key(request.url, self.base_url), value)
+        return response
+
+    def close(self):
+        self.store.save()
+        super().close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Answers calls from recorded responses without touching the network.
+    Each body gets a content ETag, so conditional requests revalidate with
+    a 304 like the live API. Missing keys get an empty 404. Counts calls.
+    """
+
+    def __init__(self, responses, base_url: str, latency: float = 0.0):
+        super().__init__()
+        self.responses = responses
+        self.base_url = base_url
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        key = fixture_key(request.url, self.base_url)
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response._content_consumed = True  # Lets iter_content serve stream=True callers
+        if key not in self.responses:
+            response.status_code = 404
+            response._content = b''
+            return response
+
+        body = json.dumps(self.responses.get(key)).encode()
+        etag = _etag(body)
+        response.headers['ETag'] = etag
+        if request.headers.get('If-None-Match') == etag:
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = 200
+            response._content = body
+            response.headers['Content-Type'] = 'application/json'
+        return response
+
+    def close(self):
+        pass
+
+
+def mount_transport(session: requests.Session, base_url: str, mode: str,
+                    fixture: Union[str, dict, None], latency: float = 0.0, pool_size: int = 10):
+    """
+    Mount the record or replay adapter on a session; live mode leaves it unchanged.
+    fixture is a fixture file path, or for replay an in-memory {key: body} dict.
+    """
+    if mode == LIVE:
+        return None
+    if not fixture:
+        raise ValueError(f"SLEEPER_FIXTURE is required in {mode} mode")
+    store = fixture if isinstance(fixture, dict) and mode == REPLAY else FixtureStore(fixture)
+    if mode == RECORD:
+        # Blocks for a free connection like the live adapter, so recording doesn't change pooling
+        adapter = RecordingAdapter(store, base_url, pool_connections=pool_size, pool_maxsize=pool_size,
+                                   pool_block=True)
+        atexit.register(store.save)
+    elif mode == REPLAY:
+        adapter = ReplayAdapter(store, base_url, latency)
+    else:
+        raise ValueError(f"Unknown transport mode: {mode}")
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
+
+
+def serve_fixture(fixture_path: str, host: str = '127.0.0.1', port: int = 8765,
+                  latency: float = 0.0) -> ThreadingHTTPServer:
+    """Local HTTP stand-in for the Sleeper API serving a recorded fixture under /v1"""
+    store = FixtureStore(fixture_path)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            path = urlsplit(self.path).path
+            key = path[len('/v1/'):] if path.startswith('/v1/') else path.lstrip('/')
+            if key not in store:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = json.dumps(store.get(key)).encode()
+            etag = _etag(body)
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve a recorded Sleeper fixture over HTTP")
+    parser.add_argument('fixture')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="Simulated milliseconds per call")
+    args = parser.parse_args()
+    server = serve_fixture(args.fixture, args.host, args.port, args.latency / 1000)
+    print(f"Serving {args.fixture} at http://{args.host}:{args.port}/v1")
+    server.serve_forever()
@@ -0,0 +1,39 @@
+# utils/warmup.py
+import importlib
+import threading
+import time
+from typing import Dict, Iterable
+
+# Third-party modules the data pages need, slowest first. Only leaf
+# dependencies are listed: importing them from a second thread can't
+# interleave with the script thread's imports of our own modules.
+HEAVY_MODULES = ('pandas', 'numpy', 'plotly.express', 'requests')
+
+_lock = threading.Lock()
+_thread = None
+import_times: Dict[str, float] = {}  # Module -> seconds spent importing it in the background
+
+
+def _import_all(modules: Iterable[str]):
+    for module in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            print(f"Error warming import {module}: {e}")
+        import_times[module] = time.perf_counter() - start
+
+
+def warm_imports(modules: Iterable[str] = HEAVY_MODULES) -> threading.Thread:
+    """
+    Import heavy dependencies on a daemon thread, once per process, so a
+    page that rendered without them has them loaded by the time the user
+    asks for data. Safe to call on every rerun.
+    """
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_import_all, args=(tuple(modules),),
+                                       name="import-warmup", daemon=True)
+            _thread.start()
+        return _thread